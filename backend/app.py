@@ -1,15 +1,76 @@
-from flask import Flask, jsonify, request, session, send_from_directory
+from flask import Flask, jsonify, request, session, send_from_directory, has_request_context, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
 import hashlib
 import uuid
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, timezone, date
 import os
 import re
+import time
+import threading
 import functools
+import click
+import hmac
+import json
+from urllib.parse import urlencode
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from db import router, apply_migrations, pending_migrations, SharedConnection, UnitOfWork, DatabaseUnavailable, statements
+from cache import TTLCache, SnapshotStore, ResponseCache, caches
+from pubsub import create_broker
+from ingest import GroupCommitWriter
+import images
+from content import process_post, make_excerpt
+from mappers import Mapper
+
+# JSON encoding
+# orjson (optional) is several times faster than the stdlib encoder on our list
+# endpoints. Either way dates/datetimes are emitted as ISO 8601 strings, so
+# handlers can pass DB values through without formatting them field by field.
+def json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+class FastJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+    ensure_ascii = False
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', json_default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+    
+    def dumps_bytes(self, obj, pretty=False):
+        if orjson is None:
+            if pretty:
+                return self.dumps(obj, indent=2).encode('utf-8')
+            return self.dumps(obj, separators=(',', ':')).encode('utf-8')
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=json_default, option=option)
+    
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Compact in production, indented when debugging (or compact=False)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, pretty), mimetype=self.mimetype)
 
 app = Flask(__name__, static_folder='../dist', static_url_path='/')
+app.json = FastJSONProvider(app)
 app.secret_key = 'science_hub_secret_key'  # For session management
 
 # Login required decorator
@@ -80,7 +141,7 @@ CORS(app,
      origins=allowed_origins, 
      allow_headers=["Content-Type", "Authorization", "X-Requested-With", "X-User-ID", "Access-Control-Allow-Origin"],
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
-     expose_headers=["Content-Type", "Authorization", "X-User-ID"],
+     expose_headers=["Content-Type", "Authorization", "X-User-ID", "X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count", "Age", "X-Stale"],
      allow_origin_regex=r"https://.*\.ngrok-free\.app")
 
 # Configure session to work with CORS
@@ -91,20 +152,416 @@ app.config.update(
     PERMANENT_SESSION_LIFETIME=timedelta(days=7)  # Extend session lifetime
 )
 
+# Seconds a session keeps reading from the primary after it writes something,
+# so users see their own new posts/replies even if replicas lag behind
+DB_STICKY_SECONDS = float(os.environ.get("DB_STICKY_SECONDS", 5))
+
+# Reads (GET/HEAD) go to a replica unless the session wrote recently
+def should_read_from_replica():
+    if not has_request_context() or request.method not in ('GET', 'HEAD'):
+        return False
+    return session.get('primary_until', 0) <= time.time()
+
 # Database connection function
-def get_db_connection():
-    return mysql.connector.connect(
-        host= os.environ.get("DB_HOST"),
-        user= os.environ.get("DB_USER"),
-        password= os.environ.get("DB_PASS"),
-        database= os.environ.get("DB_NAME")
-    )
+# readonly=None routes by request method; pass False to force the primary
+def get_db_connection(readonly=None):
+    if not has_request_context():
+        return router.connection(readonly=bool(readonly))
+    # Requests dispatched inside /api/batch share one connection, opened on first use
+    batch_scope = g.get('batch_scope')
+    if batch_scope is not None and readonly is not False:
+        if batch_scope['connection'] is None:
+            batch_scope['connection'] = batch_scope['unit_of_work'].connection(readonly=batch_scope['readonly'])
+        return SharedConnection(batch_scope['connection'])
+    if readonly is None:
+        readonly = should_read_from_replica()
+    return request_unit_of_work().connection(readonly=readonly)
+
+# Unit of work
+# Connections a request takes through get_db_connection() belong to the
+# request: when it ends, whatever is still open is committed if the response
+# succeeded, rolled back otherwise, and released together with its cursors.
+# Handlers still commit and close explicitly; this catches the paths they
+# miss (unexpected exceptions, forgotten closes).
+def request_unit_of_work():
+    unit_of_work = g.get('unit_of_work')
+    if unit_of_work is None:
+        unit_of_work = g.unit_of_work = UnitOfWork(router)
+        unit_of_work.succeeded = False
+    return unit_of_work
+
+# The commit happens here, before the response is sent, so a write whose
+# commit fails is reported as a 500 instead of a success. Streamed responses
+# may still use their connections and are finished at teardown.
+@app.after_request
+def finish_unit_of_work_before_response(response):
+    unit_of_work = g.get('unit_of_work')
+    if unit_of_work is None:
+        return response
+    unit_of_work.succeeded = response.status_code < 400
+    if response.is_streamed:
+        return response
+    g.pop('unit_of_work')
+    leaked = unit_of_work.open_connections()
+    if leaked and response.status_code >= 500:
+        print(f"Releasing {leaked} connection(s) left open by failed {request.method} {request.path}")
+    try:
+        unit_of_work.finish(commit=unit_of_work.succeeded)
+    except Error as e:
+        print(f"Commit at end of {request.method} {request.path} failed: {e}")
+        response = jsonify({"error": "Failed to save changes"})
+        response.status_code = 500
+    return response
+
+@app.teardown_request
+def finish_unit_of_work(exc):
+    unit_of_work = g.pop('unit_of_work', None)
+    if unit_of_work is None:
+        return
+    leaked = unit_of_work.open_connections()
+    if leaked and exc is not None:
+        print(f"Releasing {leaked} connection(s) left open by {request.method} {request.path}: {exc}")
+    try:
+        unit_of_work.finish(commit=exc is None and unit_of_work.succeeded)
+    except Exception as e:
+        print(f"Commit at end of {request.method} {request.path} failed: {e}")
+
+# While the database's circuit breaker is open, requests that need it fail at
+# once instead of queueing behind connect timeouts; routes that don't touch the
+# database (the SPA, media) keep working.
+@app.errorhandler(DatabaseUnavailable)
+def database_unavailable(e):
+    response = jsonify({"error": "Database temporarily unavailable"})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(int(e.retry_after) + 1)
+    return response
+
+@app.after_request
+def stick_to_primary_after_write(response):
+    # /api/batch is a POST but only ever dispatches reads
+    if (DB_STICKY_SECONDS > 0 and request.method in ('POST', 'PUT', 'PATCH', 'DELETE')
+            and request.endpoint != 'batch' and response.status_code < 400):
+        session['primary_until'] = time.time() + DB_STICKY_SECONDS
+    return response
+
+# Requests in flight, reported by /healthz and /readyz. Requests dispatched
+# inside /api/batch share the outer request's g and count as part of it.
+request_counts = {"inFlight": 0, "peakInFlight": 0, "total": 0}
+request_counts_lock = threading.Lock()
+
+@app.before_request
+def count_request_start():
+    if g.get('counted_request') is None:
+        g.counted_request = request._get_current_object()
+        with request_counts_lock:
+            request_counts['inFlight'] += 1
+            request_counts['total'] += 1
+            request_counts['peakInFlight'] = max(request_counts['peakInFlight'], request_counts['inFlight'])
+
+@app.teardown_request
+def count_request_end(exc):
+    if g.get('counted_request') is request._get_current_object():
+        g.pop('counted_request')
+        with request_counts_lock:
+            request_counts['inFlight'] -= 1
+
+# User ID from the session, or the X-User-ID header used in development/testing
+def get_request_user_id():
+    return session.get('user_id') or request.headers.get('X-User-ID')
+
+USER_ROLE = statements.register('user_role', "SELECT role FROM users WHERE id = %s", warm_params=(0,))
+
+# Role of a user, looked up at most once per request
+def get_user_role(db, user_id):
+    roles = g.setdefault('user_roles', {})
+    if user_id not in roles:
+        user = statements.fetchone(db, USER_ROLE, (user_id,))
+        roles[user_id] = user[0] if user else None
+    return roles[user_id]
+
+# Images: uploads are referenced as /media/<key>; responses point at a right-sized variant
+MEDIA_BASE_URL = os.environ.get("MEDIA_BASE_URL", "").rstrip('/')
+MEDIA_KEY_RE = re.compile(r'^/media/([0-9a-f]{20})$')
+# Both must be in images.AVATAR_WIDTHS, the sizes initials avatars are rendered at
+AUTHOR_AVATAR_SIZE = 64
+TEAM_AVATAR_SIZE = 256
+COVER_LIST_WIDTH = 480
+COVER_DETAIL_WIDTH = 1600
+
+def media_variant_url(url, width):
+    match = MEDIA_KEY_RE.match(url or '')
+    if not match:
+        return url
+    return f"{MEDIA_BASE_URL}/media/{match.group(1)}-{width}"
+
+# Uploaded avatars get a resized variant; missing/placeholder avatars a locally rendered initials avatar
+def avatar_url(avatar, name, size):
+    if not avatar or avatar == 'default-avatar.png' or avatar.startswith('https://ui-avatars.com/api/'):
+        if not images.available():
+            return avatar
+        return f"{MEDIA_BASE_URL}/media/{images.initials_avatar_key(name)}-{size}"
+    return media_variant_url(avatar, size)
+
+# Row mappers
+# Reads use plain tuple cursors; each resource's response shape is compiled
+# once here (see mappers.py) and shared by every endpoint that returns it.
+MAPPER_HELPERS = {
+    'avatar_url': avatar_url,
+    'media_variant_url': media_variant_url,
+    'AUTHOR_AVATAR_SIZE': AUTHOR_AVATAR_SIZE,
+    'TEAM_AVATAR_SIZE': TEAM_AVATAR_SIZE,
+    'COVER_LIST_WIDTH': COVER_LIST_WIDTH,
+    'COVER_DETAIL_WIDTH': COVER_DETAIL_WIDTH
+}
+# Authored rows carry only author_id; "author" is filled in from the
+# user-summary cache by hydrate_authors()
+
+BLOG_POST_SUMMARY = Mapper('blog_post_summary', [
+    ('bp.id', 'id'), ('bp.title', 'title'), ('bp.excerpt', 'excerpt'), ('bp.published_at', 'published_at'),
+    ('bp.read_time', 'read_time'), ('bp.cover_image', 'cover_image'),
+    ('bp.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "title": "title",
+    "excerpt": "excerpt",
+    "author": "None",
+    "publishedAt": "published_at",
+    "readTime": "read_time",
+    "coverImage": "media_variant_url(cover_image, COVER_LIST_WIDTH)"
+}, MAPPER_HELPERS)
+
+# tags (and comments) are filled in by the handler after mapping
+BLOG_POST_LIST_ITEM = Mapper('blog_post_list_item', [
+    ('bp.id', 'id'), ('bp.title', 'title'), ('bp.excerpt', 'excerpt'), ('bp.content', 'content'),
+    ('bp.published_at', 'published_at'), ('bp.read_time', 'read_time'), ('bp.word_count', 'word_count'),
+    ('bp.cover_image', 'cover_image'),
+    ('bp.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "title": "title",
+    "excerpt": "excerpt",
+    "content": "content",
+    "author": "None",
+    "publishedAt": "published_at",
+    "readTime": "read_time",
+    "wordCount": "word_count",
+    "coverImage": "media_variant_url(cover_image, COVER_LIST_WIDTH)",
+    "tags": "[]"
+}, MAPPER_HELPERS)
+
+BLOG_POST = Mapper('blog_post', [
+    ('bp.id', 'id'), ('bp.title', 'title'), ('bp.excerpt', 'excerpt'), ('bp.content', 'content'),
+    ('bp.published_at', 'published_at'), ('bp.read_time', 'read_time'), ('bp.word_count', 'word_count'),
+    ('bp.content_html', 'content_html'), ('bp.cover_image', 'cover_image'),
+    ('bp.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "title": "title",
+    "excerpt": "excerpt",
+    "content": "content",
+    "author": "None",
+    "publishedAt": "published_at",
+    "readTime": "read_time",
+    "wordCount": "word_count",
+    "contentHtml": "content_html",
+    "coverImage": "media_variant_url(cover_image, COVER_DETAIL_WIDTH)",
+    "tags": "[]",
+    "comments": "[]"
+}, MAPPER_HELPERS)
+
+BLOG_COMMENT = Mapper('blog_comment', [
+    ('bc.id', 'id'), ('bc.content', 'content'), ('bc.parent_comment_id', 'parent_comment_id'),
+    ('bc.likes', 'likes'), ('bc.created_at', 'created_at'),
+    ('bc.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "author": "None",
+    "content": "content",
+    "timestamp": "created_at",
+    "likes": "likes",
+    "replies": "[]"
+}, MAPPER_HELPERS)
+
+# Forum index rows carry a preview cut in SQL instead of the full content
+FORUM_PREVIEW_CHARS = int(os.environ.get("FORUM_PREVIEW_CHARS", 280))
+FORUM_THREAD = Mapper('forum_thread', [
+    ('fp.id', 'id'), ('fp.title', 'title'),
+    (f"IF(CHAR_LENGTH(fp.content) > {FORUM_PREVIEW_CHARS}, "
+     f"CONCAT(RTRIM(LEFT(fp.content, {FORUM_PREVIEW_CHARS})), '…'), fp.content)", 'preview'),
+    ('fp.created_at', 'created_at'), ('fp.last_reply_at', 'last_reply_at'), ('fp.reply_count', 'reply_count'),
+    ('fp.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "title": "title",
+    "preview": "preview",
+    "timestamp": "created_at",
+    "lastActivity": "last_reply_at",
+    "author": "None",
+    "replies": "reply_count"
+}, MAPPER_HELPERS)
+
+FORUM_POST = Mapper('forum_post', [
+    ('fp.id', 'id'), ('fp.title', 'title'), ('fp.content', 'content'), ('fp.created_at', 'created_at'),
+    ('fp.reply_count', 'reply_count'), ('fp.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "title": "title",
+    "content": "content",
+    "timestamp": "created_at",
+    "author": "None",
+    "replyCount": "reply_count",
+    "replies": "[]"
+}, MAPPER_HELPERS)
 
-# Helper to convert DB rows to JSON-friendly format
-def format_date(date_obj):
-    if isinstance(date_obj, (datetime, date)):
-        return date_obj.isoformat()
-    return date_obj
+FORUM_REPLY = Mapper('forum_reply', [
+    ('fr.id', 'id'), ('fr.content', 'content'), ('fr.created_at', 'created_at'),
+    ('fr.author_id', 'author_id')
+], {
+    "id": "str(id)",
+    "content": "content",
+    "timestamp": "created_at",
+    "author": "None"
+}, MAPPER_HELPERS)
+
+TEAM_COLUMNS = [
+    ('id', 'id'), ('name', 'name'), ('role', 'role'), ('bio', 'bio'), ('avatar', 'avatar'),
+    ('email', 'email'), ('website', 'website'), ('twitter', 'twitter'), ('linkedin', 'linkedin')
+]
+
+EVENT_COLUMNS = [
+    ('e.id', 'id'), ('e.title', 'title'), ('e.date', 'date'), ('e.description', 'description'),
+    ('e.location', 'location'), ('e.time', 'time'), ('e.capacity', 'capacity'), ('u.name', 'creator_name'),
+    ('(SELECT COUNT(*) FROM event_registrations er WHERE er.event_id = e.id)', 'registered_users')
+]
+EVENT_SHAPE = {
+    "id": "str(id)",
+    "title": "title",
+    "date": "date",
+    "time": "time if time else ''",
+    "description": "description",
+    "location": "location",
+    "capacity": "capacity",
+    "registeredUsers": "registered_users",
+    "creator": "creator_name"
+}
+EVENT = Mapper('event', EVENT_COLUMNS, EVENT_SHAPE)
+
+# Events as seen by one signed-in user ("mine" is their registration, if any)
+MEMBER_EVENT = Mapper('member_event', EVENT_COLUMNS + [('mine.id IS NOT NULL', 'is_registered')], dict(
+    EVENT_SHAPE,
+    isRegistered="bool(is_registered)",
+    remainingCapacity="max(capacity - registered_users, 0)"
+))
+
+# Public team page (/api/team): social links as stored
+TEAM = Mapper('team', TEAM_COLUMNS, {
+    "id": "str(id)",
+    "name": "name",
+    "role": "role",
+    "bio": "bio",
+    "avatar": "avatar_url(avatar, name, TEAM_AVATAR_SIZE)",
+    "social": {"email": "email", "website": "website", "twitter": "twitter", "linkedin": "linkedin"}
+}, MAPPER_HELPERS)
+
+# Team management API (/api/team-members): numeric ids, placeholder links
+TEAM_MEMBER = Mapper('team_member', TEAM_COLUMNS, {
+    "id": "id",
+    "name": "name",
+    "role": "role",
+    "bio": "bio",
+    "avatar": "avatar_url(avatar, name, TEAM_AVATAR_SIZE)",
+    "social": {
+        "email": "email or ''",
+        "website": "website or '#'",
+        "twitter": "twitter or '#'",
+        "linkedin": "linkedin or '#'"
+    }
+}, MAPPER_HELPERS)
+
+# Hot statements, prepared once per pooled connection (see db.StatementRegistry)
+USER_SUMMARY = statements.register('user_summary', "SELECT id, name, avatar, role FROM users WHERE id = %s", warm_params=(0,))
+# Forum index pages walk idx_forum_posts_activity backwards from the cursor
+FORUM_INDEX = statements.register('forum_index', f"""
+    SELECT {FORUM_THREAD.select}
+    FROM forum_posts fp
+    ORDER BY fp.last_reply_at DESC, fp.id DESC
+    LIMIT %s
+""", warm_params=(1,))
+FORUM_INDEX_AFTER = statements.register('forum_index_after', f"""
+    SELECT {FORUM_THREAD.select}
+    FROM forum_posts fp
+    WHERE fp.last_reply_at < %s OR (fp.last_reply_at = %s AND fp.id < %s)
+    ORDER BY fp.last_reply_at DESC, fp.id DESC
+    LIMIT %s
+""")
+# Pages of a thread's replies, walking idx_forum_replies_thread in either direction
+def forum_reply_statement(name, condition, order, warm_params=None):
+    return statements.register(name, f"""
+        SELECT {FORUM_REPLY.select}
+        FROM forum_replies fr
+        WHERE fr.forum_post_id = %s{condition}
+        ORDER BY {order}
+        LIMIT %s
+    """, warm_params=warm_params)
+FORUM_REPLIES_FIRST = forum_reply_statement('forum_replies_first', '', 'fr.created_at, fr.id', warm_params=(0, 1))
+FORUM_REPLIES_AFTER = forum_reply_statement(
+    'forum_replies_after', ' AND (fr.created_at > %s OR (fr.created_at = %s AND fr.id > %s))', 'fr.created_at, fr.id')
+FORUM_REPLIES_BEFORE = forum_reply_statement(
+    'forum_replies_before', ' AND (fr.created_at < %s OR (fr.created_at = %s AND fr.id < %s))',
+    'fr.created_at DESC, fr.id DESC')
+FORUM_REPLIES_LATEST = forum_reply_statement('forum_replies_latest', '', 'fr.created_at DESC, fr.id DESC')
+# One statement for every from/to/limit combination: absent bounds are open-ended values
+# Walks idx_events_date_id for the window and counts registrations per event,
+# instead of grouping the join over the whole table
+EVENT_LIST = statements.register('event_list', f"""
+    SELECT {EVENT.select}
+    FROM events e
+    LEFT JOIN users u ON e.created_by = u.id
+    WHERE e.date >= %s AND e.date <= %s
+    ORDER BY e.date, e.id
+    LIMIT %s
+""", warm_params=(date(1000, 1, 1), date(9999, 12, 31), 1))
+MEMBER_EVENT_LIST = statements.register('member_event_list', f"""
+    SELECT {MEMBER_EVENT.select}
+    FROM events e
+    LEFT JOIN users u ON e.created_by = u.id
+    LEFT JOIN event_registrations mine ON mine.event_id = e.id AND mine.user_id = %s
+    WHERE e.date >= %s AND e.date <= %s
+    ORDER BY e.date, e.id
+    LIMIT %s
+""", warm_params=(0, date(1000, 1, 1), date(9999, 12, 31), 1))
+EVENTS_FIRST_DATE = date(1000, 1, 1)
+EVENTS_LAST_DATE = date(9999, 12, 31)
+EVENTS_NO_LIMIT = 2 ** 63 - 1
+UPCOMING_EVENTS = statements.register('upcoming_events', f"""
+    SELECT {EVENT.select}
+    FROM events e
+    LEFT JOIN users u ON e.created_by = u.id
+    WHERE e.date >= CURDATE()
+    ORDER BY e.date, e.id
+    LIMIT %s
+""", warm_params=(1,))
+
+contact_status_column_ready = False
+
+# contact_submissions.status was added after the initial schema; add it once per process if missing
+def ensure_contact_status_column():
+    global contact_status_column_ready
+    if contact_status_column_ready:
+        return
+    db = get_db_connection(readonly=False)
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT status FROM contact_submissions LIMIT 1")
+        # Make sure to fetch any results to avoid "unread result" errors
+        cursor.fetchall()
+    except Error:
+        print("Adding status column to contact_submissions table")
+        cursor.execute("ALTER TABLE contact_submissions ADD COLUMN status ENUM('new', 'read', 'replied', 'archived') DEFAULT 'new'")
+        db.commit()
+    cursor.close()
+    db.close()
+    contact_status_column_ready = True
 
 # User Authentication
 @app.route('/api/login', methods=['POST'])
@@ -274,6 +731,7 @@ def update_profile():
         cursor.execute(query, tuple(params))
         
         db.commit()
+        invalidate_user_summary(user_id)
         
         # Get updated user data for response
         cursor.execute("SELECT id, name, email, role, avatar FROM users WHERE id = %s", (user_id,))
@@ -297,83 +755,294 @@ def update_profile():
         print(f"MySQL Error: {e}")
         return jsonify({"error": f"Database error: {str(e)}"}), 500
 
+# User summaries
+# id -> name, avatar and role of users seen as authors, shared by every request
+# in the process. Lists select only author_id and hydrate authors from here
+# instead of joining users; write endpoints echo the author without re-reading
+# the row. Profile/user updates and deletes drop the entry; other workers see
+# changes within USER_CACHE_SECONDS.
+class UserSummary:
+    __slots__ = ('id', 'name', 'avatar', 'role', 'author')
+
+    def __init__(self, id, name, avatar, role):
+        self.id = id
+        self.name = name
+        self.avatar = avatar
+        self.role = role
+        # Built once and shared by every response that embeds this author
+        self.author = {"id": str(id), "name": name, "avatar": avatar_url(avatar, name, AUTHOR_AVATAR_SIZE)}
+
+user_summary_cache = TTLCache('user_summaries', maxsize=int(os.environ.get("USER_CACHE_SIZE", 10000)),
+                              ttl=int(os.environ.get("USER_CACHE_SECONDS", 300)))
+
+def user_cache_key(user_id):
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+def get_user_summary(db, user_id):
+    key = user_cache_key(user_id)
+    if key is None:
+        return None
+    summary = user_summary_cache.get(key)
+    if summary is None:
+        row = statements.fetchone(db, USER_SUMMARY, (key,))
+        if row is None:
+            return None
+        summary = UserSummary(*row)
+        user_summary_cache.set(key, summary)
+    return summary
+
+def get_user_summaries(db, user_ids):
+    summaries = {}
+    missing = []
+    for user_id in user_ids:
+        summary = user_summary_cache.get(user_id)
+        if summary is None:
+            missing.append(user_id)
+        else:
+            summaries[user_id] = summary
+    if missing:
+        cursor = db.cursor()
+        cursor.execute(f"SELECT id, name, avatar, role FROM users WHERE id IN ({', '.join(['%s'] * len(missing))})",
+                       tuple(missing))
+        for row in cursor.fetchall():
+            summary = UserSummary(*row)
+            user_summary_cache.set(summary.id, summary)
+            summaries[summary.id] = summary
+        cursor.close()
+    return summaries
+
+def get_author(db, user_id):
+    summary = get_user_summary(db, user_id)
+    return summary.author if summary is not None else None
+
+# Set item['author'] for mapped rows; author_ids[i] is the author of items[i]
+def hydrate_authors(db, items, author_ids):
+    summaries = get_user_summaries(db, set(author_ids))
+    for item, author_id in zip(items, author_ids):
+        summary = summaries.get(author_id)
+        item['author'] = summary.author if summary is not None else None
+    return items
+
+def invalidate_user_summary(user_id):
+    key = user_cache_key(user_id)
+    if key is not None:
+        user_summary_cache.delete(key)
+
+# Near-static data
+# Team, tags and upcoming events change rarely. They are cached per process,
+# primed at warm-up and rebuilt or dropped by the handlers that change them;
+# cached values are shared, so callers must not modify them.
+NEAR_STATIC_CACHE_SECONDS = int(os.environ.get("NEAR_STATIC_CACHE_SECONDS", 300))
+near_static_cache = TTLCache('near_static', maxsize=16, ttl=NEAR_STATIC_CACHE_SECONDS)
+UPCOMING_EVENTS_CACHE_SECONDS = int(os.environ.get("UPCOMING_EVENTS_CACHE_SECONDS", 60))
+
+# Whole public responses for the team and tag endpoints, encoded once per change
+snapshots = SnapshotStore('snapshots', encode=lambda data: app.json.dumps_bytes(data),
+                          max_age=NEAR_STATIC_CACHE_SECONDS)
+
+def get_near_static(key, load, db=None, ttl=None):
+    value = near_static_cache.get(key)
+    if value is None:
+        if db is None:
+            connection = get_db_connection()
+            try:
+                value = load(connection)
+            finally:
+                connection.close()
+        else:
+            value = load(db)
+        near_static_cache.set(key, value, ttl)
+    return value
+
+def load_team(db):
+    cursor = db.cursor()
+    cursor.execute(f"SELECT {TEAM.select} FROM team_members")
+    team = TEAM.all(cursor.fetchall())
+    cursor.close()
+    return team
+
+def load_team_members(db):
+    cursor = db.cursor()
+    cursor.execute(f"SELECT {TEAM_MEMBER.select} FROM team_members ORDER BY id ASC")
+    members = TEAM_MEMBER.all(cursor.fetchall())
+    cursor.close()
+    return members
+
+def load_tags(db):
+    cursor = db.cursor()
+    cursor.execute("SELECT id, name FROM tags ORDER BY name")
+    tags = [{"id": str(tag_id), "name": name} for tag_id, name in cursor.fetchall()]
+    cursor.close()
+    return tags
+
+snapshots.register('team', load_team)
+snapshots.register('team_members', load_team_members)
+snapshots.register('tags', load_tags)
+
+def snapshot_response(key):
+    snapshot = snapshots.get(key, get_db_connection)
+    response = app.response_class(snapshot.body, mimetype='application/json')
+    response.set_etag(snapshot.etag)
+    set_staleness_headers(response, snapshot)
+    return response.make_conditional(request)
+
+# Age of a stored response; X-Stale when it is served because refreshing it failed
+def set_staleness_headers(response, stored):
+    response.headers['Age'] = str(int(stored.age))
+    if stored.failed:
+        response.headers['X-Stale'] = '1'
+
+# After a committed write: rebuild from the writer's connection so the next read
+# already sees it. If that fails the snapshot is dropped and rebuilt on demand.
+def rebuild_snapshots(db, *keys):
+    for key in keys:
+        try:
+            snapshots.rebuild(key, db)
+        except Error as e:
+            print(f"Rebuilding snapshot {key} failed: {e}")
+            snapshots.delete(key)
+
+def load_tag_ids(db):
+    cursor = db.cursor()
+    cursor.execute("SELECT name, id FROM tags")
+    tag_ids = dict(cursor.fetchall())
+    cursor.close()
+    return tag_ids
+
+def load_upcoming_events(db):
+    return EVENT.all(statements.fetchall(db, UPCOMING_EVENTS, (DASHBOARD_RECENT_LIMIT,)))
+
+def rebuild_team(db):
+    rebuild_snapshots(db, 'team', 'team_members')
+
+def invalidate_upcoming_events():
+    near_static_cache.delete('upcoming_events')
+
+# Public reads: stale-while-revalidate
+# The blog, events and forum index keep their last good response per URL in
+# public_responses (see ResponseCache). Past PUBLIC_CACHE_FRESH_SECONDS it is
+# served at once while a background request refreshes it; past
+# PUBLIC_CACHE_MAX_AGE_SECONDS the request refreshes it first. If the database
+# fails either way, readers get the last good response with X-Stale instead of
+# an error. Writes expire the affected URLs on the worker that made them, and
+# a session that just wrote reads through the cache.
+PUBLIC_CACHE_FRESH_SECONDS = int(os.environ.get("PUBLIC_CACHE_FRESH_SECONDS", 10))
+PUBLIC_CACHE_MAX_AGE_SECONDS = int(os.environ.get("PUBLIC_CACHE_MAX_AGE_SECONDS", 300))
+public_responses = ResponseCache('public_responses', maxsize=int(os.environ.get("PUBLIC_CACHE_SIZE", 2000)),
+                                 fresh_seconds=PUBLIC_CACHE_FRESH_SECONDS, max_age=PUBLIC_CACHE_MAX_AGE_SECONDS)
+
+def public_cache_key():
+    return request.path + '?' + urlencode(sorted(request.args.items(multi=True)))
+
+def expire_public_responses(*paths):
+    for path in paths:
+        public_responses.expire(path + '?')
+
+def cached_public_response(stored):
+    response = app.response_class(stored.body, headers=stored.headers)
+    response.set_etag(stored.etag)
+    set_staleness_headers(response, stored)
+    return response.make_conditional(request)
+
+# Run a public view; a 200 becomes the key's last good response. Returns
+# (stored, None) for that, else (None, response). A database failure (5xx)
+# marks the key's stored response as failed.
+def render_public_response(key, view, view_args):
+    try:
+        response = app.make_response(view(**view_args))
+    except DatabaseUnavailable as e:
+        response = database_unavailable(e)
+    if response.status_code == 200 and not response.is_streamed:
+        headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+        return public_responses.store(key, response.get_data(), headers), None
+    if response.status_code >= 500:
+        public_responses.fail(key)
+    return None, response
+
+def refresh_public_response(key, view, path, query_string, view_args):
+    with app.test_request_context(path, query_string=query_string):
+        render_public_response(key, view, view_args)
+
+def stale_while_revalidate(view):
+    @functools.wraps(view)
+    def cached_view(**view_args):
+        key = public_cache_key()
+        stored, state = (None, None)
+        if should_read_from_replica():
+            stored, state = public_responses.lookup(key)
+        if state == ResponseCache.FRESH:
+            return cached_public_response(stored)
+        if state == ResponseCache.STALE:
+            public_responses.refresher.start(
+                key,
+                functools.partial(refresh_public_response, key, view, request.path, request.query_string, view_args),
+                lambda: public_responses.fail(key)
+            )
+            return cached_public_response(stored)
+        # Expired: one request refreshes it, the others keep getting the stored one meanwhile
+        if state == ResponseCache.EXPIRED and not public_responses.refresher.claim(key):
+            return cached_public_response(stored)
+        try:
+            fresh, response = render_public_response(key, view, view_args)
+        finally:
+            if state == ResponseCache.EXPIRED:
+                public_responses.refresher.release(key)
+        if fresh is not None:
+            return cached_public_response(fresh)
+        if response.status_code >= 500 and stored is not None:
+            return cached_public_response(stored)
+        return response
+    return cached_view
+
 # Team Members
 @app.route('/api/team', methods=['GET'])
 def get_team():
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        cursor.execute("SELECT id, name, role, bio, avatar, email, website, twitter, linkedin FROM team_members")
-        members = cursor.fetchall()
-        cursor.close()
-        db.close()
-
-        team_data = [
-            {
-                "id": str(member["id"]),
-                "name": member["name"],
-                "role": member["role"],
-                "bio": member["bio"],
-                "avatar": member["avatar"],
-                "social": {
-                    "email": member["email"],
-                    "website": member["website"],
-                    "twitter": member["twitter"],
-                    "linkedin": member["linkedin"]
-                }
-            }
-            for member in members
-        ]
+        return snapshot_response('team')
+    except Error as e:
+        print(f"MySQL Error: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
 
-        return jsonify(team_data)
+# All tags by name, for tag pickers and filters
+@app.route('/api/tags', methods=['GET'])
+def get_tags():
+    try:
+        return snapshot_response('tags')
     except Error as e:
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Database connection failed"}), 500
 
 # Blog Posts
 @app.route('/api/blog', methods=['GET'])
+@stale_while_revalidate
 def get_blog_posts():
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Join with users table to get author information
-        cursor.execute("""
-            SELECT bp.id, bp.title, bp.excerpt, bp.content, bp.published_at, bp.read_time, bp.cover_image,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar
+        cursor.execute(f"""
+            SELECT {BLOG_POST_LIST_ITEM.select}
             FROM blog_posts bp
-            JOIN users u ON bp.author_id = u.id
             ORDER BY bp.published_at DESC
         """)
         
-        posts = cursor.fetchall()
+        rows = cursor.fetchall()
+        author_index = BLOG_POST_LIST_ITEM.index('author_id')
+        formatted_posts = hydrate_authors(db, BLOG_POST_LIST_ITEM.all(rows), [row[author_index] for row in rows])
         
         # Get tags for each post
-        formatted_posts = []
-        for post in posts:
+        for post in formatted_posts:
             cursor.execute("""
                 SELECT t.name FROM tags t
                 JOIN blog_post_tags bpt ON t.id = bpt.tag_id
                 WHERE bpt.blog_post_id = %s
             """, (post['id'],))
             
-            tags = [tag['name'] for tag in cursor.fetchall()]
-            
-            formatted_posts.append({
-                "id": str(post['id']),
-                "title": post['title'],
-                "excerpt": post['excerpt'],
-                "content": post['content'],
-                "author": {
-                    "id": str(post['author_id']),
-                    "name": post['author_name'],
-                    "avatar": post['author_avatar']
-                },
-                "publishedAt": format_date(post['published_at']),
-                "readTime": post['read_time'],
-                "coverImage": post['cover_image'],
-                "tags": tags
-            })
+            post['tags'] = [name for (name,) in cursor.fetchall()]
         
         cursor.close()
         db.close()
@@ -400,14 +1069,10 @@ def get_new_blog_template():
     try:
         # Get the user's info for the template
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        cursor.execute("SELECT id, name, avatar, role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        cursor.close()
+        author = get_author(db, user_id)
         db.close()
         
-        if not user:
+        if not author:
             return jsonify({"error": "User not found"}), 404
         
         # Return an empty blog post template with the user as the author
@@ -416,12 +1081,8 @@ def get_new_blog_template():
             "title": "",
             "excerpt": "",
             "content": "",
-            "author": {
-                "id": str(user['id']),
-                "name": user['name'],
-                "avatar": user['avatar']
-            },
-            "publishedAt": format_date(datetime.now()),
+            "author": author,
+            "publishedAt": datetime.now(),
             "readTime": "1 min read",
             "coverImage": "",
             "tags": [],
@@ -432,17 +1093,16 @@ def get_new_blog_template():
         return jsonify({"error": "Database connection failed"}), 500
 
 @app.route('/api/blog/<int:post_id>', methods=['GET'])
+@stale_while_revalidate
 def get_blog_post(post_id):
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Get post with author info
-        cursor.execute("""
-            SELECT bp.id, bp.title, bp.excerpt, bp.content, bp.published_at, bp.read_time, bp.cover_image,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar
+        cursor.execute(f"""
+            SELECT {BLOG_POST.select}
             FROM blog_posts bp
-            JOIN users u ON bp.author_id = u.id
             WHERE bp.id = %s
         """, (post_id,))
         
@@ -460,14 +1120,13 @@ def get_blog_post(post_id):
             WHERE bpt.blog_post_id = %s
         """, (post_id,))
         
-        tags = [tag['name'] for tag in cursor.fetchall()]
+        formatted_post = BLOG_POST.map(post)
+        formatted_post['tags'] = [name for (name,) in cursor.fetchall()]
         
         # Get comments
-        cursor.execute("""
-            SELECT bc.id, bc.content, bc.parent_comment_id, bc.likes, bc.created_at,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar
+        cursor.execute(f"""
+            SELECT {BLOG_COMMENT.select}
             FROM blog_comments bc
-            JOIN users u ON bc.author_id = u.id
             WHERE bc.blog_post_id = %s
             ORDER BY bc.created_at
         """, (post_id,))
@@ -478,46 +1137,28 @@ def get_blog_post(post_id):
         comments_by_id = {}
         top_level_comments = []
         
+        # Post and comment authors come from one user-summary lookup
+        authored = [formatted_post]
+        author_ids = [post[BLOG_POST.index('author_id')]]
+        
+        comment_id_index = BLOG_COMMENT.index('id')
+        parent_id_index = BLOG_COMMENT.index('parent_comment_id')
+        author_id_index = BLOG_COMMENT.index('author_id')
         for comment in all_comments:
-            formatted_comment = {
-                "id": str(comment['id']),
-                "author": {
-                    "id": str(comment['author_id']),
-                    "name": comment['author_name'],
-                    "avatar": comment['author_avatar']
-                },
-                "content": comment['content'],
-                "timestamp": format_date(comment['created_at']),
-                "likes": comment['likes'],
-                "replies": []
-            }
+            formatted_comment = BLOG_COMMENT.map(comment)
+            authored.append(formatted_comment)
+            author_ids.append(comment[author_id_index])
             
-            comments_by_id[comment['id']] = formatted_comment
+            comments_by_id[comment[comment_id_index]] = formatted_comment
             
-            if comment['parent_comment_id'] is None:
+            parent_id = comment[parent_id_index]
+            if parent_id is None:
                 top_level_comments.append(formatted_comment)
-            else:
-                parent_id = comment['parent_comment_id']
-                if parent_id in comments_by_id:
-                    comments_by_id[parent_id]['replies'].append(formatted_comment)
-        
-        # Format the final response
-        formatted_post = {
-            "id": str(post['id']),
-            "title": post['title'],
-            "excerpt": post['excerpt'],
-            "content": post['content'],
-            "author": {
-                "id": str(post['author_id']),
-                "name": post['author_name'],
-                "avatar": post['author_avatar']
-            },
-            "publishedAt": format_date(post['published_at']),
-            "readTime": post['read_time'],
-            "coverImage": post['cover_image'],
-            "tags": tags,
-            "comments": top_level_comments
-        }
+            elif parent_id in comments_by_id:
+                comments_by_id[parent_id]['replies'].append(formatted_comment)
+        
+        hydrate_authors(db, authored, author_ids)
+        formatted_post['comments'] = top_level_comments
         
         cursor.close()
         db.close()
@@ -554,29 +1195,31 @@ def create_blog_post():
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Check user exists
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
+        user = get_user_summary(db, user_id)
         
-        print(f"User ID: {user_id}, Role: {user['role'] if user else 'No role found'}")
+        print(f"User ID: {user_id}, Role: {user.role if user else 'No role found'}")
         
         if not user:
             cursor.close()
             db.close()
             return jsonify({"error": "User not found"}), 404
             
-        # Calculate read time - rough estimate based on word count
-        word_count = len(content.split())
-        read_time = f"{max(1, round(word_count / 200))} min read"  # Assuming 200 words per minute
+        # Render/sanitize once here so reads only serve stored fields
+        derived = process_post(content, excerpt)
+        excerpt = derived['excerpt']
+        read_time = derived['read_time']
         
         try:
             # Insert blog post
             cursor.execute("""
-                INSERT INTO blog_posts (title, content, excerpt, author_id, read_time, cover_image) 
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (title, content, excerpt, user_id, read_time, cover_image))
+                INSERT INTO blog_posts (title, content, excerpt, author_id, read_time, cover_image,
+                                        content_html, search_body, word_count) 
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (title, content, excerpt, user_id, read_time, cover_image,
+                  derived['content_html'], derived['search_body'], derived['word_count']))
             
             blog_post_id = cursor.lastrowid
             print(f"Created blog post with ID: {blog_post_id}")
@@ -586,18 +1229,23 @@ def create_blog_post():
             db.close()
             return jsonify({"error": f"Failed to create blog post: {str(e)}"}), 500
         
-        # Process tags
+        # Process tags; known tag ids come from the near-static cache
+        tag_ids = get_near_static('tag_ids', load_tag_ids, db)
+        new_tag_ids = {}
         for tag_name in tags:
-            # Check if tag exists
-            cursor.execute("SELECT id FROM tags WHERE name = %s", (tag_name,))
-            tag = cursor.fetchone()
-            
-            if tag:
-                tag_id = tag['id']
-            else:
-                # Create new tag
-                cursor.execute("INSERT INTO tags (name) VALUES (%s)", (tag_name,))
-                tag_id = cursor.lastrowid
+            tag_id = tag_ids.get(tag_name) or new_tag_ids.get(tag_name)
+            if tag_id is None:
+                # Check if tag exists (created since the cache was loaded, or differing in case)
+                cursor.execute("SELECT id FROM tags WHERE name = %s", (tag_name,))
+                tag = cursor.fetchone()
+                
+                if tag:
+                    tag_id = tag[0]
+                else:
+                    # Create new tag
+                    cursor.execute("INSERT INTO tags (name) VALUES (%s)", (tag_name,))
+                    tag_id = cursor.lastrowid
+                new_tag_ids[tag_name] = tag_id
             
             # Link tag to post
             cursor.execute("""
@@ -606,10 +1254,10 @@ def create_blog_post():
             """, (blog_post_id, tag_id))
         
         db.commit()
-        
-        # Get the author info for the response
-        cursor.execute("SELECT name, avatar FROM users WHERE id = %s", (user_id,))
-        author = cursor.fetchone()
+        expire_public_responses('/api/blog')
+        if new_tag_ids:
+            near_static_cache.delete('tag_ids')
+            rebuild_snapshots(db, 'tags')
         
         cursor.close()
         db.close()
@@ -619,13 +1267,11 @@ def create_blog_post():
             "title": title,
             "excerpt": excerpt,
             "content": content,
-            "author": {
-                "id": str(user_id),
-                "name": author['name'],
-                "avatar": author['avatar']
-            },
-            "publishedAt": format_date(datetime.now()),
+            "author": user.author,
+            "publishedAt": datetime.now(),
             "readTime": read_time,
+            "wordCount": derived['word_count'],
+            "contentHtml": derived['content_html'],
             "coverImage": cover_image,
             "tags": tags,
             "comments": []
@@ -651,7 +1297,7 @@ def add_blog_comment(post_id):
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Check if blog post exists
         cursor.execute("SELECT id FROM blog_posts WHERE id = %s", (post_id,))
@@ -669,67 +1315,91 @@ def add_blog_comment(post_id):
         comment_id = cursor.lastrowid
         
         # Get author info for response
-        cursor.execute("SELECT name, avatar FROM users WHERE id = %s", (user_id,))
-        author = cursor.fetchone()
+        author = get_author(db, user_id)
         
         db.commit()
+        expire_public_responses(f'/api/blog/{post_id}')
         cursor.close()
         db.close()
         
-        return jsonify({
+        comment = {
             "id": str(comment_id),
             "content": content,
-            "author": {
-                "id": str(user_id),
-                "name": author['name'],
-                "avatar": author['avatar']
-            },
-            "timestamp": format_date(datetime.now()),
+            "author": author,
+            "timestamp": datetime.now(),
             "likes": 0,
             "replies": []
+        }
+        broker.publish(f"blog:{post_id}", {
+            "event": "comment",
+            "data": dict(comment, parentCommentId=str(parent_comment_id) if parent_comment_id else None)
         })
+        
+        return jsonify(comment)
     except Error as e:
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Database error: " + str(e)}), 500
 
+# Parse an optional YYYY-MM-DD query parameter; raises ValueError on bad input
+def get_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.strptime(value.split('T')[0], '%Y-%m-%d').date()
+
+MAX_EVENTS_LIMIT = 500
+
+# ?from=YYYY-MM-DD&to=YYYY-MM-DD&limit=N as (from, to, limit) statement parameters,
+# absent bounds open-ended; raises ValueError on a bad date
+def get_event_window_params():
+    date_from = get_date_arg('from')
+    date_to = get_date_arg('to')
+    limit = request.args.get('limit', type=int)
+    return (
+        date_from or EVENTS_FIRST_DATE,
+        date_to or EVENTS_LAST_DATE,
+        EVENTS_NO_LIMIT if limit is None else max(1, min(limit, MAX_EVENTS_LIMIT))
+    )
+
 # Events
+# Optional ?from=YYYY-MM-DD&to=YYYY-MM-DD&limit=N restrict the listing to a date window
 @app.route('/api/events', methods=['GET'])
+@stale_while_revalidate
 def get_events():
+    try:
+        params = get_event_window_params()
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Please use YYYY-MM-DD format."}), 400
+    
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT e.id, e.title, e.date, e.description, e.location, e.time, e.capacity,
-                   u.name as creator_name,
-                   COUNT(er.id) as registered_users
-            FROM events e
-            LEFT JOIN users u ON e.created_by = u.id
-            LEFT JOIN event_registrations er ON e.id = er.event_id
-            GROUP BY e.id
-            ORDER BY e.date
-        """)
-        
-        events = cursor.fetchall()
-        cursor.close()
+        events = EVENT.all(statements.fetchall(db, EVENT_LIST, params))
         db.close()
         
-        formatted_events = [
-            {
-                "id": str(event['id']),
-                "title": event['title'],
-                "date": format_date(event['date']),
-                "time": event['time'] if event['time'] else '',
-                "description": event['description'],
-                "location": event['location'],
-                "capacity": event['capacity'],
-                "registeredUsers": event['registered_users'],
-                "creator": event['creator_name']
-            }
-            for event in events
-        ]
+        return jsonify(events)
+    except Error as e:
+        print(f"MySQL Error: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+# The events listing for the signed-in user: each event with isRegistered and
+# remainingCapacity, in one query. Same ?from=&to=&limit= window as /api/events
+@app.route('/api/user/events', methods=['GET'])
+def get_user_events():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    
+    try:
+        params = get_event_window_params()
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Please use YYYY-MM-DD format."}), 400
+    
+    try:
+        db = get_db_connection()
+        events = MEMBER_EVENT.all(statements.fetchall(db, MEMBER_EVENT_LIST, (user_id,) + params))
+        db.close()
         
-        return jsonify(formatted_events)
+        return jsonify(events)
     except Error as e:
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Database connection failed"}), 500
@@ -823,6 +1493,9 @@ def create_event():
             # Get the event ID and commit immediately to ensure it's saved
             event_id = cursor.lastrowid
             db.commit()
+            ics_cache.delete('events')
+            invalidate_upcoming_events()
+            expire_public_responses('/api/events')
             
             print(f"Created event with ID: {event_id}")
             
@@ -831,7 +1504,7 @@ def create_event():
                 "id": str(event_id),
                 "title": title,
                 "description": description,
-                "date": format_date(event_date),
+                "date": event_date,
                 "time": time,
                 "location": location,
                 "capacity": capacity,
@@ -850,6 +1523,8 @@ def create_event():
             db.close()
             return jsonify({"error": f"Database error: {str(e)}"}), 500
             
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         print(f"Unexpected error in create_event: {e}")
         return jsonify({"error": f"Server error: {str(e)}"}), 500
@@ -905,6 +1580,9 @@ def register_for_event(event_id):
         """, (event_id, user_id))
         
         db.commit()
+        ics_cache.delete(f"user:{user_id}")
+        invalidate_upcoming_events()
+        expire_public_responses('/api/events')
         cursor.close()
         db.close()
         
@@ -963,6 +1641,9 @@ def unregister_from_event(event_id):
         """, (event_id, user_id))
         
         db.commit()
+        ics_cache.delete(f"user:{user_id}")
+        invalidate_upcoming_events()
+        expire_public_responses('/api/events')
         cursor.close()
         db.close()
         
@@ -1002,119 +1683,323 @@ def get_user_event_registrations():
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Database error: " + str(e)}), 500
 
+# iCalendar feeds
+# Rendered feeds are cached until an event is created or the user's registrations
+# change; the TTL only bounds staleness across worker processes.
+ics_cache = TTLCache('ics_feeds', maxsize=10000, ttl=int(os.environ.get("ICS_CACHE_SECONDS", 900)))
+
+def ics_escape(value):
+    value = str(value or '')
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                 .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+# Fold content lines longer than 75 octets (RFC 5545 section 3.1)
+def ics_fold(line):
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        # Don't split in the middle of a multi-byte character
+        while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+# Feeds are rendered only from event data (DTSTAMP is the event's updated_at),
+# so the same events give the same bytes and ETag on every worker and after
+# every cache refill, and pollers get 304s. The queries select updated_at as
+# UNIX_TIMESTAMP(), which converts from the session time zone, so the UTC
+# stamp is right whatever time zone the server runs in
+def ics_timestamp(seconds):
+    return datetime.fromtimestamp(int(seconds), timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def render_ics(events, calendar_name):
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Science Hub//Events//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{ics_escape(calendar_name)}'
+    ]
+    for event in events:
+        # Event times are free-form text, so publish all-day entries and keep the time in the description
+        description = event['description'] or ''
+        if event['time']:
+            description = f"{event['time']}\n\n{description}"
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:event-{event['id']}@sciencehub",
+            f"DTSTAMP:{ics_timestamp(event['updated_at'])}",
+            f"DTSTART;VALUE=DATE:{event['date'].strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{(event['date'] + timedelta(days=1)).strftime('%Y%m%d')}",
+            f"SUMMARY:{ics_escape(event['title'])}",
+            f"LOCATION:{ics_escape(event['location'])}",
+            f'DESCRIPTION:{ics_escape(description)}',
+            'END:VEVENT'
+        ]
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(ics_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+# Return the cached feed for `key`, rendering it with `load_events(cursor)` on a miss.
+# There is no Last-Modified: removing an event or a registration doesn't move
+# the newest updated_at forward, so If-Modified-Since would hide the removal;
+# the ETag changes with the body.
+def get_ics_feed(key, calendar_name, load_events):
+    feed = ics_cache.get(key)
+    if feed is None:
+        db = get_db_connection()
+        cursor = db.cursor(dictionary=True)
+        events = load_events(cursor)
+        cursor.close()
+        db.close()
+        body = render_ics(events, calendar_name)
+        feed = {"body": body, "etag": hashlib.sha1(body).hexdigest()}
+        ics_cache.set(key, feed)
+    return feed
+
+def ics_response(feed, cache_control):
+    response = app.response_class(feed['body'], mimetype='text/calendar')
+    response.headers['Content-Disposition'] = 'inline; filename="events.ics"'
+    response.headers['Cache-Control'] = cache_control
+    response.set_etag(feed['etag'])
+    # Answers If-None-Match with 304 and no body
+    return response.make_conditional(request)
+
+# Calendar apps can't send session cookies, so per-user feeds are authorized by a signed token
+def calendar_feed_token(user_id):
+    return hmac.new(app.secret_key.encode(), f"ics:{user_id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+@app.route('/api/events.ics', methods=['GET'])
+def get_events_feed():
+    def load_events(cursor):
+        cursor.execute("""
+            SELECT id, title, date, time, description, location, UNIX_TIMESTAMP(updated_at) AS updated_at
+            FROM events
+            ORDER BY date, id
+        """)
+        return cursor.fetchall()
+    
+    try:
+        feed = get_ics_feed('events', 'Science Hub Events', load_events)
+        return ics_response(feed, 'public, max-age=300')
+    except Error as e:
+        print(f"MySQL Error in get_events_feed: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+@app.route('/api/users/<int:user_id>/events.ics', methods=['GET'])
+def get_user_events_feed(user_id):
+    token = request.args.get('token', '')
+    if not hmac.compare_digest(token, calendar_feed_token(user_id)):
+        return jsonify({"error": "Invalid calendar token"}), 403
+    
+    def load_events(cursor):
+        cursor.execute("""
+            SELECT e.id, e.title, e.date, e.time, e.description, e.location,
+                   UNIX_TIMESTAMP(e.updated_at) AS updated_at
+            FROM event_registrations er
+            JOIN events e ON er.event_id = e.id
+            WHERE er.user_id = %s
+            ORDER BY e.date, e.id
+        """, (user_id,))
+        return cursor.fetchall()
+    
+    try:
+        feed = get_ics_feed(f"user:{user_id}", 'My Science Hub Events', load_events)
+        return ics_response(feed, 'private, max-age=300')
+    except Error as e:
+        print(f"MySQL Error in get_user_events_feed: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+# Subscription URLs for the logged-in user's calendar app
+@app.route('/api/user/calendar-feed', methods=['GET'])
+def get_calendar_feed_urls():
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    
+    return jsonify({
+        "events": request.host_url.rstrip('/') + '/api/events.ics',
+        "registrations": request.host_url.rstrip('/') + f"/api/users/{user_id}/events.ics?token={calendar_feed_token(user_id)}"
+    })
+
+# Keyset pagination cursor: "<ISO timestamp>~<id>" of the last row on a page
+def encode_cursor(timestamp, row_id):
+    return f"{timestamp.isoformat()}~{row_id}"
+
+def decode_cursor(value):
+    try:
+        timestamp, row_id = value.rsplit('~', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (AttributeError, ValueError):
+        return None
+
+FORUM_PAGE_SIZE = 30
+FORUM_MAX_PAGE_SIZE = 100
+
 # Forum Posts
+# Threads by last activity, newest first: ?limit=N&cursor=<X-Next-Cursor of the previous page>
 @app.route('/api/forum', methods=['GET'])
+@stale_while_revalidate
 def get_forum_posts():
+    limit = min(max(request.args.get('limit', FORUM_PAGE_SIZE, type=int), 1), FORUM_MAX_PAGE_SIZE)
+    cursor_arg = request.args.get('cursor')
+    after = decode_cursor(cursor_arg) if cursor_arg else None
+    if cursor_arg and after is None:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT fp.id, fp.title, fp.content, fp.created_at,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar,
-                   COUNT(fr.id) as reply_count
-            FROM forum_posts fp
-            JOIN users u ON fp.author_id = u.id
-            LEFT JOIN forum_replies fr ON fp.id = fr.forum_post_id
-            GROUP BY fp.id
-            ORDER BY fp.created_at DESC
-        """)
-        
-        posts = cursor.fetchall()
-        cursor.close()
+        # One extra row tells whether there is a next page
+        if after is None:
+            rows = statements.fetchall(db, FORUM_INDEX, (limit + 1,))
+        else:
+            rows = statements.fetchall(db, FORUM_INDEX_AFTER, (after[0], after[0], after[1], limit + 1))
+        rows, more = rows[:limit], len(rows) > limit
+        author_index = FORUM_THREAD.index('author_id')
+        threads = hydrate_authors(db, FORUM_THREAD.all(rows), [row[author_index] for row in rows])
         db.close()
         
-        formatted_posts = []
-        for post in posts:
-            formatted_posts.append({
-                "id": str(post['id']),
-                "title": post['title'],
-                "content": post['content'],
-                "timestamp": format_date(post['created_at']),
-                "author": {
-                    "id": str(post['author_id']),
-                    "name": post['author_name'],
-                    "avatar": post['author_avatar']
-                },
-                "replies": post['reply_count']
-            })
-        
-        print(f"Retrieved {len(formatted_posts)} forum posts")
-        return jsonify(formatted_posts)
+        response = jsonify(threads)
+        if more:
+            last = rows[-1]
+            response.headers['X-Next-Cursor'] = encode_cursor(last[FORUM_THREAD.index('last_reply_at')],
+                                                              last[FORUM_THREAD.index('id')])
+        return response
     except Error as e:
         print(f"MySQL Error in get_forum_posts: {e}")
         return jsonify({"error": "Database connection failed"}), 500
 
+FORUM_REPLY_PAGE_SIZE = 50
+FORUM_REPLY_MAX_PAGE_SIZE = 200
+
+# Reply page selection, oldest first within a page:
+#   (nothing)          first page
+#   ?cursor=<next>     the page after a cursor (X-Next-Cursor)
+#   ?before=<prev>     the page before a cursor (X-Prev-Cursor)
+#   ?latest=1          the last page ("jump to latest")
+# plus ?limit=N. Returns None if a cursor doesn't parse.
+def get_reply_page_args(min_limit=1):
+    page = {
+        "limit": min(max(request.args.get('limit', FORUM_REPLY_PAGE_SIZE, type=int), min_limit),
+                     FORUM_REPLY_MAX_PAGE_SIZE),
+        "after": None,
+        "before": None,
+        "latest": request.args.get('latest') in ('1', 'true')
+    }
+    for name, arg in (('after', 'cursor'), ('before', 'before')):
+        if request.args.get(arg):
+            page[name] = decode_cursor(request.args[arg])
+            if page[name] is None:
+                return None
+    return page
+
+# One page of a thread's replies; returns (rows, next_cursor, prev_cursor), where
+# a cursor is only set if there are more replies in that direction
+def fetch_forum_reply_page(db, post_id, limit, after=None, before=None, latest=False):
+    fetch = limit + 1  # One extra row tells whether there is more
+    if before is not None or latest:
+        if before is not None:
+            rows = statements.fetchall(db, FORUM_REPLIES_BEFORE, (post_id, before[0], before[0], before[1], fetch))
+        else:
+            rows = statements.fetchall(db, FORUM_REPLIES_LATEST, (post_id, fetch))
+        more_before, more_after = len(rows) > limit, before is not None
+        rows = rows[:limit][::-1]
+    else:
+        if after is not None:
+            rows = statements.fetchall(db, FORUM_REPLIES_AFTER, (post_id, after[0], after[0], after[1], fetch))
+        else:
+            rows = statements.fetchall(db, FORUM_REPLIES_FIRST, (post_id, fetch))
+        more_before, more_after = after is not None, len(rows) > limit
+        rows = rows[:limit]
+    
+    if not rows:
+        return rows, None, None
+    created_index, id_index = FORUM_REPLY.index('created_at'), FORUM_REPLY.index('id')
+    next_cursor = encode_cursor(rows[-1][created_index], rows[-1][id_index]) if more_after else None
+    prev_cursor = encode_cursor(rows[0][created_index], rows[0][id_index]) if more_before else None
+    return rows, next_cursor, prev_cursor
+
+def set_page_cursors(response, next_cursor, prev_cursor):
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    if prev_cursor:
+        response.headers['X-Prev-Cursor'] = prev_cursor
+    return response
+
+# Thread header with the first (or selected) page of replies; ?limit=0 returns the header alone
 @app.route('/api/forum/<int:post_id>', methods=['GET'])
 def get_forum_post(post_id):
+    page = get_reply_page_args(min_limit=0)
+    if page is None:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        print(f"Fetching forum post ID: {post_id}")
+        cursor = db.cursor()
         
         # Get post with author info
-        cursor.execute("""
-            SELECT fp.id, fp.title, fp.content, fp.created_at,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar
+        cursor.execute(f"""
+            SELECT {FORUM_POST.select}
             FROM forum_posts fp
-            JOIN users u ON fp.author_id = u.id
             WHERE fp.id = %s
         """, (post_id,))
         
         post = cursor.fetchone()
+        cursor.close()
         
         if not post:
-            cursor.close()
             db.close()
             print(f"Forum post ID {post_id} not found")
             return jsonify({"error": "Post not found"}), 404
         
-        # Get replies
-        cursor.execute("""
-            SELECT fr.id, fr.content, fr.created_at,
-                   u.id as author_id, u.name as author_name, u.avatar as author_avatar
-            FROM forum_replies fr
-            JOIN users u ON fr.author_id = u.id
-            WHERE fr.forum_post_id = %s
-            ORDER BY fr.created_at
-        """, (post_id,))
-        
-        replies = cursor.fetchall()
-        
-        formatted_replies = []
-        for reply in replies:
-            formatted_replies.append({
-                "id": str(reply['id']),
-                "content": reply['content'],
-                "timestamp": format_date(reply['created_at']),
-                "author": {
-                    "id": str(reply['author_id']),
-                    "name": reply['author_name'],
-                    "avatar": reply['author_avatar']
-                }
-            })
-        
-        print(f"Found {len(formatted_replies)} replies for forum post ID {post_id}")
-        
-        formatted_post = {
-            "id": str(post['id']),
-            "title": post['title'],
-            "content": post['content'],
-            "timestamp": format_date(post['created_at']),
-            "author": {
-                "id": str(post['author_id']),
-                "name": post['author_name'],
-                "avatar": post['author_avatar']
-            },
-            "replies": formatted_replies
-        }
+        formatted_post = FORUM_POST.map(post)
+        replies, next_cursor, prev_cursor = [], None, None
+        if page['limit'] > 0:
+            replies, next_cursor, prev_cursor = fetch_forum_reply_page(db, post_id, **page)
+            formatted_post['replies'] = FORUM_REPLY.all(replies)
+        author_index = FORUM_REPLY.index('author_id')
+        hydrate_authors(db, [formatted_post] + formatted_post['replies'],
+                        [post[FORUM_POST.index('author_id')]] + [row[author_index] for row in replies])
+        db.close()
         
-        return jsonify(formatted_post)
+        return set_page_cursors(jsonify(formatted_post), next_cursor, prev_cursor)
     except Error as e:
         print(f"MySQL Error in get_forum_post: {e}")
         return jsonify({"error": "Database connection failed"}), 500
 
+# Pages of replies without the thread header; same paging arguments as get_forum_post
+@app.route('/api/forum/<int:post_id>/replies', methods=['GET'])
+def get_forum_replies(post_id):
+    page = get_reply_page_args()
+    if page is None:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    try:
+        db = get_db_connection()
+        replies, next_cursor, prev_cursor = fetch_forum_reply_page(db, post_id, **page)
+        if not replies:
+            # Only an empty page pays for telling "no replies" from "no such post"
+            cursor = db.cursor()
+            cursor.execute("SELECT 1 FROM forum_posts WHERE id = %s", (post_id,))
+            exists = cursor.fetchone() is not None
+            cursor.close()
+            if not exists:
+                db.close()
+                return jsonify({"error": "Post not found"}), 404
+        author_index = FORUM_REPLY.index('author_id')
+        formatted_replies = hydrate_authors(db, FORUM_REPLY.all(replies), [row[author_index] for row in replies])
+        db.close()
+        
+        return set_page_cursors(jsonify(formatted_replies), next_cursor, prev_cursor)
+    except Error as e:
+        print(f"MySQL Error in get_forum_replies: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
 # Forum Post Creation
 @app.route('/api/forum', methods=['POST'])
 def create_forum_post():
@@ -1135,7 +2020,7 @@ def create_forum_post():
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Insert forum post
         try:
@@ -1153,10 +2038,10 @@ def create_forum_post():
             return jsonify({"error": f"Failed to create forum post: {str(e)}"}), 500
         
         # Get author info for the response
-        cursor.execute("SELECT name, avatar FROM users WHERE id = %s", (user_id,))
-        author = cursor.fetchone()
+        author = get_author(db, user_id)
         
         db.commit()
+        expire_public_responses('/api/forum')
         cursor.close()
         db.close()
         
@@ -1164,12 +2049,8 @@ def create_forum_post():
             "id": str(post_id),
             "title": title,
             "content": content,
-            "timestamp": format_date(datetime.now()),
-            "author": {
-                "id": str(user_id),
-                "name": author['name'],
-                "avatar": author['avatar']
-            },
+            "timestamp": datetime.now(),
+            "author": author,
             "replies": 0
         })
     except Error as e:
@@ -1195,12 +2076,16 @@ def add_forum_reply(post_id):
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
-        # Check if forum post exists
-        cursor.execute("SELECT id FROM forum_posts WHERE id = %s", (post_id,))
-        post = cursor.fetchone()
-        if not post:
+        # Bump the thread's activity; no row means the post doesn't exist.
+        # updated_at = updated_at keeps the post's own edit time unchanged
+        cursor.execute("""
+            UPDATE forum_posts
+            SET last_reply_at = CURRENT_TIMESTAMP, reply_count = reply_count + 1, updated_at = updated_at
+            WHERE id = %s
+        """, (post_id,))
+        if cursor.rowcount == 0:
             cursor.close()
             db.close()
             print(f"Forum post ID {post_id} not found when trying to add reply")
@@ -1222,30 +2107,63 @@ def add_forum_reply(post_id):
             return jsonify({"error": f"Failed to create forum reply: {str(e)}"}), 500
         
         # Get author info for response
-        cursor.execute("SELECT name, avatar FROM users WHERE id = %s", (user_id,))
-        author = cursor.fetchone()
+        author = get_author(db, user_id)
         
         db.commit()
+        expire_public_responses('/api/forum')
         cursor.close()
         db.close()
         
         response_data = {
             "id": str(reply_id),
             "content": content,
-            "timestamp": format_date(datetime.now()),
-            "author": {
-                "id": str(user_id),
-                "name": author['name'],
-                "avatar": author['avatar']
-            }
+            "timestamp": datetime.now(),
+            "author": author
         }
         print(f"Sending forum reply response: {response_data}")
+        broker.publish(f"forum:{post_id}", {"event": "reply", "data": response_data})
         
         return jsonify(response_data)
     except Error as e:
         print(f"MySQL Error in add_forum_reply: {e}")
         return jsonify({"error": f"Database error: {str(e)}"}), 500
 
+# Live updates (Server-Sent Events)
+# Readers keep one idle stream open per thread and receive new replies/comments
+# as they are committed, instead of refetching the whole thread.
+broker = create_broker()
+SSE_KEEPALIVE_SECONDS = 15
+
+def event_stream(channel):
+    subscription = broker.subscribe(channel)
+    
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                message = subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                data = message['data']
+                yield f"event: {message['event']}\nid: {data['id']}\ndata: {app.json.dumps(data)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+    
+    response = app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Disable nginx response buffering
+    return response
+
+@app.route('/api/forum/<int:post_id>/stream', methods=['GET'])
+def stream_forum_replies(post_id):
+    return event_stream(f"forum:{post_id}")
+
+@app.route('/api/blog/<int:post_id>/stream', methods=['GET'])
+def stream_blog_comments(post_id):
+    return event_stream(f"blog:{post_id}")
+
 # Contact Form
 @app.route('/api/contact', methods=['POST'])
 def submit_contact():
@@ -1276,7 +2194,54 @@ def submit_contact():
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Failed to submit contact form"}), 500
 
+USER_ROLES = ('user', 'researcher', 'editor', 'moderator', 'admin')
+USER_STATUSES = ('active', 'muted', 'banned', 'suspended')
+# ?sort= values; id breaks ties so pages don't overlap
+USER_LIST_SORTS = {
+    'newest': 'created_at DESC, id DESC',
+    'oldest': 'created_at ASC, id ASC',
+    'name': 'name ASC, id ASC',
+    'email': 'email ASC'
+}
+
+# Escape LIKE wildcards so user input only ever matches as a literal prefix
+def like_prefix(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+# ?role=&status=&q=&sort= for the admin user list; returns (filters, error)
+def get_user_list_args():
+    filters = {
+        "role": request.args.get('role') or None,
+        "status": request.args.get('status') or None,
+        "q": (request.args.get('q') or '').strip() or None,
+        "sort": request.args.get('sort') or 'newest'
+    }
+    if filters['role'] is not None and filters['role'] not in USER_ROLES:
+        return None, f"Invalid role. Must be one of: {', '.join(USER_ROLES)}"
+    if filters['status'] is not None and filters['status'] not in USER_STATUSES:
+        return None, f"Invalid status. Must be one of: {', '.join(USER_STATUSES)}"
+    if filters['sort'] not in USER_LIST_SORTS:
+        return None, f"Invalid sort. Must be one of: {', '.join(USER_LIST_SORTS)}"
+    return filters, None
+
+# WHERE clause and parameters for the filters; every condition is an index range
+def user_list_filters(filters):
+    conditions, params = [], []
+    if filters['role'] is not None:
+        conditions.append("role = %s")
+        params.append(filters['role'])
+    if filters['status'] is not None:
+        conditions.append("status = %s")
+        params.append(filters['status'])
+    if filters['q'] is not None:
+        conditions.append("(name LIKE %s OR email LIKE %s)")
+        params += [like_prefix(filters['q'])] * 2
+    return ' AND '.join(conditions) or 'TRUE', tuple(params)
+
 # User Management API - Admin only
+# Filter with ?role=, ?status= and ?q= (name or email prefix), order with ?sort=
+# (newest, oldest, name, email) and page with ?page=&pageSize=. The response is
+# the page of users; X-Total-Count has the number of matching users.
 @app.route('/api/users', methods=['GET'])
 def get_users():
     # Check if user is logged in and is an admin
@@ -1290,32 +2255,50 @@ def get_users():
     if not user_id:
         return jsonify({"error": "Authentication required"}), 401
     
+    filters, error = get_user_list_args()
+    if error:
+        return jsonify({"error": error}), 400
+    page, page_size, offset = get_pagination_args()
+    
     try:
         db = get_db_connection()
         cursor = db.cursor(dictionary=True)
         
         # Check if user has admin role
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin access required"}), 403
         
-        # Fetch all users
-        cursor.execute("SELECT id, name, email, role, avatar, created_at as joinDate FROM users ORDER BY created_at DESC")
+        where, params = user_list_filters(filters)
+        
+        cursor.execute(f"SELECT COUNT(*) AS total FROM users WHERE {where}", params)
+        total = cursor.fetchone()['total']
+        
+        # Pick the page's ids from the index first, then read only those rows
+        order = USER_LIST_SORTS[filters['sort']]
+        cursor.execute(f"""
+            SELECT u.id, u.name, u.email, u.role, u.status, u.avatar, u.created_at as joinDate
+            FROM users u
+            JOIN (
+                SELECT id FROM users
+                WHERE {where}
+                ORDER BY {order}
+                LIMIT %s OFFSET %s
+            ) page USING (id)
+            ORDER BY {order}
+        """, params + (page_size, offset))
         users = cursor.fetchall()
         
-        # Process dates to ensure JSON serialization
         for user in users:
-            if 'joinDate' in user and user['joinDate']:
-                user['joinDate'] = format_date(user['joinDate'])
+            user['avatar'] = avatar_url(user['avatar'], user['name'], AUTHOR_AVATAR_SIZE)
         
         cursor.close()
         db.close()
         
-        return jsonify(users)
+        response = jsonify(users)
+        response.headers['X-Total-Count'] = str(total)
+        return response
     except Error as e:
         print(f"MySQL Error in get_users: {e}")
         return jsonify({"error": "Database error"}), 500
@@ -1338,10 +2321,7 @@ def get_user(user_id):
         cursor = db.cursor(dictionary=True)
         
         # If user is not admin and not viewing their own profile, deny access
-        cursor.execute("SELECT role FROM users WHERE id = %s", (session_user_id,))
-        user_role = cursor.fetchone()
-        
-        if (not user_role or user_role['role'] != 'admin') and session_user_id != user_id:
+        if get_user_role(db, session_user_id) != 'admin' and session_user_id != user_id:
             cursor.close()
             db.close()
             return jsonify({"error": "Admin access required or can only view your own profile"}), 403
@@ -1355,10 +2335,6 @@ def get_user(user_id):
             db.close()
             return jsonify({"error": "User not found"}), 404
         
-        # Process dates for JSON
-        if 'joinDate' in user and user['joinDate']:
-            user['joinDate'] = format_date(user['joinDate'])
-        
         cursor.close()
         db.close()
         
@@ -1401,10 +2377,7 @@ def create_user():
         cursor = db.cursor(dictionary=True)
         
         # Check if user has admin role
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin access required"}), 403
@@ -1429,10 +2402,6 @@ def create_user():
         cursor.execute("SELECT id, name, email, role, avatar, created_at as joinDate FROM users WHERE id = %s", (new_user_id,))
         new_user = cursor.fetchone()
         
-        # Process dates for JSON
-        if 'joinDate' in new_user and new_user['joinDate']:
-            new_user['joinDate'] = format_date(new_user['joinDate'])
-        
         cursor.close()
         db.close()
         
@@ -1476,11 +2445,8 @@ def update_user(user_id):
         cursor = db.cursor(dictionary=True)
         
         # Check if user has admin role
-        cursor.execute("SELECT role FROM users WHERE id = %s", (session_user_id,))
-        user_role = cursor.fetchone()
-        
         # Only admin can update other users, or users can update their own profile
-        if (not user_role or user_role['role'] != 'admin') and session_user_id != user_id:
+        if get_user_role(db, session_user_id) != 'admin' and session_user_id != user_id:
             cursor.close()
             db.close()
             return jsonify({"error": "Admin access required or can only update your own profile"}), 403
@@ -1515,7 +2481,7 @@ def update_user(user_id):
         
         if role:
             # Non-admin users can't change their own role
-            if user_role['role'] != 'admin' and session_user_id == user_id:
+            if get_user_role(db, session_user_id) != 'admin' and session_user_id == user_id:
                 cursor.close()
                 db.close()
                 return jsonify({"error": "Cannot change your own role"}), 403
@@ -1537,15 +2503,12 @@ def update_user(user_id):
         )
         
         db.commit()
+        invalidate_user_summary(user_id)
         
         # Fetch the updated user for response
         cursor.execute("SELECT id, name, email, role, avatar, created_at as joinDate FROM users WHERE id = %s", (user_id,))
         updated_user = cursor.fetchone()
         
-        # Process dates for JSON
-        if 'joinDate' in updated_user and updated_user['joinDate']:
-            updated_user['joinDate'] = format_date(updated_user['joinDate'])
-        
         cursor.close()
         db.close()
         
@@ -1576,10 +2539,7 @@ def delete_user(user_id):
         cursor = db.cursor(dictionary=True)
         
         # Check if user has admin role
-        cursor.execute("SELECT role FROM users WHERE id = %s", (session_user_id,))
-        user_role = cursor.fetchone()
-        
-        if not user_role or user_role['role'] != 'admin':
+        if get_user_role(db, session_user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin access required"}), 403
@@ -1591,9 +2551,28 @@ def delete_user(user_id):
             db.close()
             return jsonify({"error": "User not found"}), 404
         
+        # Their replies go with them (ON DELETE CASCADE); keep other threads' reply counts right
+        cursor.execute("""
+            UPDATE forum_posts fp
+            JOIN (
+                SELECT forum_post_id, COUNT(*) AS replies
+                FROM forum_replies
+                WHERE author_id = %s
+                GROUP BY forum_post_id
+            ) fr ON fr.forum_post_id = fp.id
+            SET fp.reply_count = fp.reply_count - fr.replies, fp.updated_at = fp.updated_at
+        """, (user_id,))
+        
         # Delete the user
         cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
         db.commit()
+        # Their events went with them (ON DELETE CASCADE), out of the public feed
+        # and every feed of a user registered for one
+        ics_cache.clear()
+        invalidate_user_summary(user_id)
+        invalidate_upcoming_events()
+        # Their posts, comments and replies are gone too
+        public_responses.expire('/api/')
         
         cursor.close()
         db.close()
@@ -1616,30 +2595,14 @@ def get_contact_requests():
         return jsonify({"error": "Authentication required"}), 401
     
     try:
+        ensure_contact_status_column()
         db = get_db_connection()
         
         # Check if user is admin
-        auth_cursor = db.cursor(dictionary=True)
-        auth_cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = auth_cursor.fetchone()
-        auth_cursor.close()
-        
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
         
-        # Check if status column exists and add it if it doesn't
-        check_cursor = db.cursor()
-        try:
-            check_cursor.execute("SELECT status FROM contact_submissions LIMIT 1")
-            # Make sure to fetch any results to avoid "unread result" errors
-            check_cursor.fetchall()
-        except Error:
-            print("Adding status column to contact_submissions table")
-            check_cursor.execute("ALTER TABLE contact_submissions ADD COLUMN status ENUM('new', 'read', 'replied', 'archived') DEFAULT 'new'")
-            db.commit()
-        check_cursor.close()
-        
         # Get all contact submissions with a fresh cursor
         data_cursor = db.cursor(dictionary=True)
         data_cursor.execute("""
@@ -1655,10 +2618,6 @@ def get_contact_requests():
         """)
         contact_requests = data_cursor.fetchall()
         
-        # Convert datetime objects to strings
-        for contact in contact_requests:
-            contact['created_at'] = format_date(contact['created_at'])
-        
         data_cursor.close()
         db.close()
         
@@ -1684,17 +2643,10 @@ def submit_contact_request():
         return jsonify({"error": "Please provide a valid email address"}), 400
     
     try:
+        ensure_contact_status_column()
         db = get_db_connection()
         cursor = db.cursor()
         
-        # Add a column for status if it doesn't exist
-        try:
-            cursor.execute("SELECT status FROM contact_submissions LIMIT 1")
-        except Error:
-            print("Adding status column to contact_submissions table")
-            cursor.execute("ALTER TABLE contact_submissions ADD COLUMN status ENUM('new', 'read', 'replied', 'archived') DEFAULT 'new'")
-            db.commit()
-        
         # Insert the contact request
         cursor.execute(
             "INSERT INTO contact_submissions (name, email, subject, message, created_at, is_read, status) VALUES (%s, %s, %s, %s, %s, %s, %s)",
@@ -1737,9 +2689,7 @@ def update_contact_request(request_id):
         cursor = db.cursor(dictionary=True)
         
         # Check if user is admin
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
@@ -1791,9 +2741,7 @@ def delete_contact_request(request_id):
         cursor = db.cursor(dictionary=True)
         
         # Check if user is admin
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
@@ -1823,41 +2771,7 @@ def delete_contact_request(request_id):
 @app.route('/api/team-members', methods=['GET'])
 def get_team_members():
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT id, name, role, bio, avatar, email as social_email, 
-                   website as social_website, twitter as social_twitter, 
-                   linkedin as social_linkedin, created_at, updated_at 
-            FROM team_members
-            ORDER BY id ASC
-        """)
-        
-        team_members = cursor.fetchall()
-        
-        # Convert datetime objects to strings and restructure for frontend
-        formatted_members = []
-        for member in team_members:
-            formatted_member = {
-                'id': member['id'],
-                'name': member['name'],
-                'role': member['role'],
-                'bio': member['bio'],
-                'avatar': member['avatar'],
-                'social': {
-                    'email': member['social_email'] or '',
-                    'website': member['social_website'] or '#',
-                    'twitter': member['social_twitter'] or '#',
-                    'linkedin': member['social_linkedin'] or '#'
-                }
-            }
-            formatted_members.append(formatted_member)
-        
-        cursor.close()
-        db.close()
-        
-        return jsonify(formatted_members)
+        return snapshot_response('team_members')
     except Error as e:
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Failed to fetch team members"}), 500
@@ -1865,42 +2779,12 @@ def get_team_members():
 @app.route('/api/team-members/<int:member_id>', methods=['GET'])
 def get_team_member(member_id):
     try:
-        db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT id, name, role, bio, avatar, email as social_email, 
-                   website as social_website, twitter as social_twitter, 
-                   linkedin as social_linkedin, created_at, updated_at 
-            FROM team_members
-            WHERE id = %s
-        """, (member_id,))
+        members = snapshots.get('team_members', get_db_connection).data
+        formatted_member = next((member for member in members if member['id'] == member_id), None)
         
-        member = cursor.fetchone()
-        
-        if not member:
-            cursor.close()
-            db.close()
+        if not formatted_member:
             return jsonify({"error": "Team member not found"}), 404
         
-        # Convert datetime objects to strings and restructure for frontend
-        formatted_member = {
-            'id': member['id'],
-            'name': member['name'],
-            'role': member['role'],
-            'bio': member['bio'],
-            'avatar': member['avatar'],
-            'social': {
-                'email': member['social_email'] or '',
-                'website': member['social_website'] or '#',
-                'twitter': member['social_twitter'] or '#',
-                'linkedin': member['social_linkedin'] or '#'
-            }
-        }
-        
-        cursor.close()
-        db.close()
-        
         return jsonify(formatted_member)
     except Error as e:
         print(f"MySQL Error: {e}")
@@ -1929,12 +2813,10 @@ def create_team_member():
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Check if user is admin
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
@@ -1960,33 +2842,17 @@ def create_team_member():
         )
         
         db.commit()
+        rebuild_team(db)
         new_id = cursor.lastrowid
         
         # Fetch the newly created team member
-        cursor.execute("""
-            SELECT id, name, role, bio, avatar, email as social_email, 
-                   website as social_website, twitter as social_twitter, 
-                   linkedin as social_linkedin, created_at, updated_at 
+        cursor.execute(f"""
+            SELECT {TEAM_MEMBER.select}
             FROM team_members
             WHERE id = %s
         """, (new_id,))
         
-        member = cursor.fetchone()
-        
-        # Convert datetime objects to strings and restructure for frontend
-        formatted_member = {
-            'id': member['id'],
-            'name': member['name'],
-            'role': member['role'],
-            'bio': member['bio'],
-            'avatar': member['avatar'],
-            'social': {
-                'email': member['social_email'] or '',
-                'website': member['social_website'] or '#',
-                'twitter': member['social_twitter'] or '#',
-                'linkedin': member['social_linkedin'] or '#'
-            }
-        }
+        formatted_member = TEAM_MEMBER.one(cursor.fetchone())
         
         cursor.close()
         db.close()
@@ -2023,12 +2889,10 @@ def update_team_member(member_id):
     
     try:
         db = get_db_connection()
-        cursor = db.cursor(dictionary=True)
+        cursor = db.cursor()
         
         # Check if user is admin
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
@@ -2064,32 +2928,16 @@ def update_team_member(member_id):
         )
         
         db.commit()
+        rebuild_team(db)
         
         # Fetch the updated team member
-        cursor.execute("""
-            SELECT id, name, role, bio, avatar, email as social_email, 
-                   website as social_website, twitter as social_twitter, 
-                   linkedin as social_linkedin, created_at, updated_at 
+        cursor.execute(f"""
+            SELECT {TEAM_MEMBER.select}
             FROM team_members
             WHERE id = %s
         """, (member_id,))
         
-        member = cursor.fetchone()
-        
-        # Convert datetime objects to strings and restructure for frontend
-        formatted_member = {
-            'id': member['id'],
-            'name': member['name'],
-            'role': member['role'],
-            'bio': member['bio'],
-            'avatar': member['avatar'],
-            'social': {
-                'email': member['social_email'] or '',
-                'website': member['social_website'] or '#',
-                'twitter': member['social_twitter'] or '#',
-                'linkedin': member['social_linkedin'] or '#'
-            }
-        }
+        formatted_member = TEAM_MEMBER.one(cursor.fetchone())
         
         cursor.close()
         db.close()
@@ -2119,9 +2967,7 @@ def delete_team_member(member_id):
         cursor = db.cursor(dictionary=True)
         
         # Check if user is admin
-        cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        if not user or user['role'] != 'admin':
+        if get_user_role(db, user_id) != 'admin':
             cursor.close()
             db.close()
             return jsonify({"error": "Admin privileges required"}), 403
@@ -2136,6 +2982,7 @@ def delete_team_member(member_id):
         # Delete the team member
         cursor.execute("DELETE FROM team_members WHERE id = %s", (member_id,))
         db.commit()
+        rebuild_team(db)
         
         cursor.close()
         db.close()
@@ -2148,6 +2995,379 @@ def delete_team_member(member_id):
         print(f"MySQL Error: {e}")
         return jsonify({"error": "Failed to delete team member"}), 500
 
+# Dashboards
+# One request per panel instead of a fetch per resource: a single connection,
+# a single authorization check, and short-lived cached counts.
+dashboard_cache = TTLCache('dashboard_counts', maxsize=8, ttl=int(os.environ.get("DASHBOARD_CACHE_SECONDS", 30)))
+
+DASHBOARD_RECENT_LIMIT = 5
+
+def fetch_upcoming_events(db):
+    return get_near_static('upcoming_events', load_upcoming_events, db, UPCOMING_EVENTS_CACHE_SECONDS)
+
+# Blog post summaries (no content or tags) for dashboard lists
+def fetch_recent_blog_posts(db, limit):
+    cursor = db.cursor()
+    cursor.execute(f"""
+        SELECT {BLOG_POST_SUMMARY.select}
+        FROM blog_posts bp
+        ORDER BY bp.published_at DESC
+        LIMIT %s
+    """, (limit,))
+    rows = cursor.fetchall()
+    cursor.close()
+    author_index = BLOG_POST_SUMMARY.index('author_id')
+    return hydrate_authors(db, BLOG_POST_SUMMARY.all(rows), [row[author_index] for row in rows])
+
+def fetch_dashboard_counts(cursor):
+    counts = dashboard_cache.get('counts')
+    if counts is None:
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM users) as users,
+                   (SELECT COUNT(*) FROM events) as events,
+                   (SELECT COUNT(*) FROM events WHERE date >= CURDATE()) as upcomingEvents,
+                   (SELECT COUNT(*) FROM blog_posts) as blogPosts,
+                   (SELECT COUNT(*) FROM forum_posts) as forumPosts,
+                   (SELECT COUNT(*) FROM team_members) as teamMembers,
+                   (SELECT COUNT(*) FROM club_registrations) as clubRegistrations,
+                   (SELECT COUNT(*) FROM contact_submissions
+                    WHERE COALESCE(status, 'new') NOT IN ('replied', 'archived')
+                      AND (is_read IS NULL OR is_read = 0)) as pendingContactRequests
+        """)
+        counts = {key: int(value) for key, value in cursor.fetchone().items()}
+        dashboard_cache.set('counts', counts)
+    return counts
+
+# Member/editor dashboard: upcoming events (with the user's registration state) and recent posts
+@app.route('/api/dashboard', methods=['GET'])
+def get_member_dashboard():
+    user_id = get_request_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    
+    try:
+        db = get_db_connection()
+        cursor = db.cursor(dictionary=True)
+        
+        upcoming_events = fetch_upcoming_events(db)
+        recent_posts = fetch_recent_blog_posts(db, DASHBOARD_RECENT_LIMIT)
+        
+        cursor.execute("SELECT event_id FROM event_registrations WHERE user_id = %s", (user_id,))
+        registered_ids = {str(row['event_id']) for row in cursor.fetchall()}
+        
+        cursor.close()
+        db.close()
+        
+        return jsonify({
+            "upcomingEvents": [dict(event, isRegistered=event['id'] in registered_ids) for event in upcoming_events],
+            "recentPosts": recent_posts,
+            "registeredEventIds": sorted(registered_ids)
+        })
+    except Error as e:
+        print(f"MySQL Error in get_member_dashboard: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+# Admin dashboard: counts, recent items and pending contact requests
+@app.route('/api/dashboard/admin', methods=['GET'])
+def get_admin_dashboard():
+    user_id = get_request_user_id()
+    if not user_id:
+        return jsonify({"error": "Authentication required"}), 401
+    
+    try:
+        ensure_contact_status_column()
+        db = get_db_connection()
+        cursor = db.cursor(dictionary=True)
+        
+        if get_user_role(db, user_id) != 'admin':
+            cursor.close()
+            db.close()
+            return jsonify({"error": "Admin privileges required"}), 403
+        
+        counts = fetch_dashboard_counts(cursor)
+        upcoming_events = fetch_upcoming_events(db)
+        recent_posts = fetch_recent_blog_posts(db, DASHBOARD_RECENT_LIMIT)
+        
+        cursor.execute("""
+            SELECT id, name, email, role, avatar, created_at as joinDate
+            FROM users
+            ORDER BY created_at DESC
+            LIMIT %s
+        """, (DASHBOARD_RECENT_LIMIT,))
+        recent_users = cursor.fetchall()
+        
+        cursor.execute("""
+            SELECT id, name, email, subject, message, created_at, 'new' as status
+            FROM contact_submissions
+            WHERE COALESCE(status, 'new') NOT IN ('replied', 'archived')
+              AND (is_read IS NULL OR is_read = 0)
+            ORDER BY created_at DESC
+            LIMIT 20
+        """)
+        pending_requests = cursor.fetchall()
+        
+        cursor.close()
+        db.close()
+        
+        return jsonify({
+            "counts": counts,
+            "upcomingEvents": upcoming_events,
+            "recentPosts": recent_posts,
+            "recentUsers": recent_users,
+            "pendingContactRequests": pending_requests
+        })
+    except Error as e:
+        print(f"MySQL Error in get_admin_dashboard: {e}")
+        return jsonify({"error": "Database connection failed"}), 500
+
+# Batch API
+# Runs several GET requests in-process: one HTTP round trip, one session decode
+# and one pooled connection shared by every handler in the batch.
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", 20))
+BATCH_FORWARDED_HEADERS = ('X-User-ID', 'Authorization', 'Accept', 'Accept-Language', 'User-Agent')
+
+def dispatch_batched_get(path, outer_session, headers):
+    ctx = app.test_request_context(path, method='GET', headers=headers,
+                                   base_url=request.host_url,
+                                   environ_base={'REMOTE_ADDR': request.remote_addr})
+    # Reuse the already-decoded session instead of parsing the cookie again
+    ctx.session = outer_session
+    with ctx:
+        if request.endpoint in (None, 'static', 'serve_react'):
+            return {"path": path, "status": 404, "body": {"error": "Not found"}}
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            # One failing handler must not throw away its siblings' results
+            print(f"Error in batched GET {path}: {e!r}")
+            return {"path": path, "status": 500, "body": {"error": "Internal server error"}}
+        if response.is_streamed:
+            response.close()
+            return {"path": path, "status": 400, "body": {"error": "Streaming endpoints cannot be batched"}}
+        body = response.get_json(silent=True) if response.is_json else response.get_data(as_text=True)
+        return {"path": path, "status": response.status_code, "body": body}
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "requests must be a non-empty list of GET paths"}), 400
+    if len(items) > BATCH_MAX_REQUESTS:
+        return jsonify({"error": f"A batch can contain at most {BATCH_MAX_REQUESTS} requests"}), 400
+    
+    paths = []
+    for item in items:
+        path = item.get('path') if isinstance(item, dict) else item
+        if not isinstance(path, str) or not path.startswith('/api/') or path.split('?')[0] == '/api/batch':
+            return jsonify({"error": f"Invalid batch path: {path}"}), 400
+        paths.append(path)
+    
+    headers = {name: request.headers[name] for name in BATCH_FORWARDED_HEADERS if name in request.headers}
+    outer_session = session._get_current_object()
+    with UnitOfWork(router) as unit_of_work:
+        g.batch_scope = {"unit_of_work": unit_of_work, "connection": None,
+                         "readonly": session.get('primary_until', 0) <= time.time()}
+        try:
+            results = [dispatch_batched_get(path, outer_session, headers) for path in paths]
+        finally:
+            g.pop('batch_scope')
+    
+    return jsonify(results)
+
+# Image uploads and media
+IMAGE_MAX_BYTES = int(os.environ.get("IMAGE_MAX_BYTES", 10 * 1024 * 1024))
+MEDIA_FILE_RE = re.compile(r'^([0-9a-z]+?)(?:-(\d+))?(?:\.(webp|jpg))?$')
+
+@app.route('/api/uploads/images', methods=['POST'])
+def upload_image():
+    if not get_request_user_id():
+        return jsonify({"error": "Authentication required"}), 401
+    if not images.available():
+        return jsonify({"error": "Image processing is not available on this server"}), 503
+    
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({"error": "An image file is required"}), 400
+    if request.content_length and request.content_length > IMAGE_MAX_BYTES:
+        return jsonify({"error": "Image is too large"}), 413
+    data = upload.read(IMAGE_MAX_BYTES + 1)
+    if len(data) > IMAGE_MAX_BYTES:
+        return jsonify({"error": "Image is too large"}), 413
+    
+    try:
+        key = images.store_upload(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "success": True,
+        # Store this URL in avatar/coverImage; API responses serve a sized variant of it
+        "url": f"/media/{key}",
+        "variants": {str(width): f"{MEDIA_BASE_URL}/media/{key}-{width}" for width in images.VARIANT_WIDTHS}
+    }), 201
+
+# /media/<key>[-<width>][.webp|.jpg] - without an extension the format follows the Accept header
+@app.route('/media/<filename>', methods=['GET'])
+def serve_media(filename):
+    match = MEDIA_FILE_RE.match(filename)
+    if not match or not images.available():
+        return jsonify({"error": "Not found"}), 404
+    
+    key, width, extension = match.groups()
+    negotiated = extension is None
+    if negotiated:
+        extension = 'webp' if request.accept_mimetypes['image/webp'] else 'jpg'
+    
+    # Initials avatars are rendered on demand, so only at the sizes we link to
+    if key.startswith('i'):
+        if not width or not images.ensure_initials_avatar(key, int(width)):
+            return jsonify({"error": "Not found"}), 404
+    width = int(width) if width else images.VARIANT_WIDTHS[-1]
+    
+    variant = images.variant_filename(key, width, extension)
+    if not os.path.exists(os.path.join(images.VARIANTS_DIR, variant)):
+        return jsonify({"error": "Not found"}), 404
+    
+    response = send_from_directory(images.VARIANTS_DIR, variant, mimetype=images.FORMATS[extension][1])
+    # File names are content-addressed, so they never change
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    if negotiated:
+        response.headers['Vary'] = 'Accept'
+    return response
+
+# Warm-up
+# Opens the connection pools, prepares the hot statements on every pooled
+# connection and primes the near-static caches, so the first requests after a
+# deploy or worker recycle don't pay for it. Runs in the background; /readyz
+# answers 503 until it has finished.
+warm_up_state = {"status": "pending", "startedAt": None, "seconds": None, "connections": None, "error": None}
+warm_up_lock = threading.Lock()
+
+def warm_up():
+    started = time.monotonic()
+    connections = router.warm(statements.warm)
+    with UnitOfWork(router) as unit_of_work:
+        db = unit_of_work.connection(readonly=True)
+        for key in ('team', 'team_members', 'tags'):
+            snapshots.rebuild(key, db)
+        get_near_static('tag_ids', load_tag_ids, db)
+        get_near_static('upcoming_events', load_upcoming_events, db, UPCOMING_EVENTS_CACHE_SECONDS)
+    return connections, time.monotonic() - started
+
+def run_warm_up():
+    try:
+        connections, seconds = warm_up()
+        warm_up_state.update(status='ready', connections=connections, seconds=round(seconds, 3), error=None)
+        print(f"Warm-up finished in {seconds:.2f}s, connections: {connections}")
+    except Exception as e:
+        warm_up_state.update(status='failed', error=str(e))
+        print(f"Warm-up failed: {e}")
+
+def start_warm_up():
+    with warm_up_lock:
+        if warm_up_state['status'] in ('running', 'ready'):
+            return
+        warm_up_state.update(status='running', startedAt=datetime.now(), error=None)
+    threading.Thread(target=run_warm_up, name='warm-up', daemon=True).start()
+
+# Health and readiness
+# /healthz (liveness) only reports in-process state and never touches the
+# database. /readyz (readiness) also needs the warm-up to have finished, the
+# primary to have an idle pooled connection, to answer a query and to have
+# every migration applied. That check borrows a connection for one query and
+# its result is reused for READY_CHECK_SECONDS, so frequent probes stay cheap.
+# Probes get only the status; the stats and check details go to admins and to
+# callers sending HEALTH_TOKEN in X-Health-Token (monitoring).
+READY_CHECK_SECONDS = float(os.environ.get("READY_CHECK_SECONDS", 5))
+HEALTH_TOKEN = os.environ.get("HEALTH_TOKEN")
+ready_check = {"checkedAt": None, "checks": None}
+ready_check_lock = threading.Lock()
+process_started = time.monotonic()
+
+def runtime_stats():
+    with request_counts_lock:
+        requests = dict(request_counts)
+    return {
+        "uptimeSeconds": round(time.monotonic() - process_started, 1),
+        "requests": requests,
+        "streams": broker.subscriber_count(),
+        "database": router.stats(),
+        "caches": {name: cache.stats() for name, cache in list(caches.items())}
+    }
+
+def run_ready_checks():
+    idle = router.primary.idle_connections()
+    checks = {"pool": {"ok": bool(idle), "idle": idle}}
+    # Without an idle connection the probe would have to open an overflow one
+    if not checks['pool']['ok']:
+        checks['database'] = {"ok": False, "error": "No idle pooled connection"}
+        return checks
+    started = time.monotonic()
+    try:
+        db = router.connection(readonly=False)
+        try:
+            pending = pending_migrations(db)
+        finally:
+            db.close()
+    except (Error, DatabaseUnavailable) as e:
+        checks['database'] = {"ok": False, "error": str(e)}
+        return checks
+    checks['database'] = {"ok": True, "seconds": round(time.monotonic() - started, 4)}
+    checks['migrations'] = {"ok": not pending, "pending": pending}
+    return checks
+
+def get_ready_checks():
+    # One probe runs the checks at a time; concurrent probes get the last result
+    if ready_check_lock.acquire(blocking=False):
+        try:
+            checked_at = ready_check['checkedAt']
+            if checked_at is None or time.monotonic() - checked_at >= READY_CHECK_SECONDS:
+                ready_check.update(checks=run_ready_checks(), checkedAt=time.monotonic())
+        finally:
+            ready_check_lock.release()
+    return ready_check['checks']
+
+# Monitoring sends X-Health-Token; signed-in admins are looked up like any admin
+# check. A database that can't answer means no details, not a failed probe
+def health_details_allowed():
+    token = request.headers.get('X-Health-Token')
+    if HEALTH_TOKEN and token and hmac.compare_digest(token, HEALTH_TOKEN):
+        return True
+    user_id = session.get('user_id')
+    if not user_id:
+        return False
+    try:
+        db = get_db_connection()
+        try:
+            return get_user_role(db, user_id) == 'admin'
+        finally:
+            db.close()
+    except (Error, DatabaseUnavailable):
+        return False
+
+# Liveness probe: 200 as long as the process can serve requests
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    if not health_details_allowed():
+        return jsonify({"status": "ok"})
+    return jsonify({"status": "ok", **runtime_stats()})
+
+# Load balancer readiness probe: 200 once warm-up has finished and the database
+# checks pass, 503 until then
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    # Launchers that don't start the warm-up themselves get it on the first probe;
+    # a failed warm-up is retried on the next one
+    if warm_up_state['status'] in ('pending', 'failed'):
+        start_warm_up()
+    checks = get_ready_checks() if warm_up_state['status'] == 'ready' else None
+    ready = checks is not None and all(check['ok'] for check in checks.values())
+    if not health_details_allowed():
+        return jsonify({"ready": ready}), 200 if ready else 503
+    return jsonify({"ready": ready, "warmUp": warm_up_state, "checks": checks, **runtime_stats()}), 200 if ready else 503
+
 # Serve React App - root route and all non-API routes
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -2159,78 +3379,130 @@ def serve_react(path=''):
     else:
         return send_from_directory(app.static_folder, 'index.html')
 
+# Club registration form fields: (JSON key, column, max length or None)
+# Required fields are checked separately; everything else defaults to ''.
+CLUB_REGISTRATION_FIELDS = [
+    ('formNo', 'form_no', 20),
+    ('registrationNo', 'registration_no', 20),
+    ('fullName', 'full_name', 100),
+    ('dateOfBirth', 'date_of_birth', None),
+    ('placeOfBirth', 'place_of_birth', 100),
+    ('gender', 'gender', 20),
+    ('bloodGroup', 'blood_group', 10),
+    ('religion', 'religion', 50),
+    ('address', 'address', None),
+    ('phoneNo', 'phone_no', 20),
+    ('email', 'email', 100),
+    ('guardianName', 'guardian_name', 100),
+    ('guardianMobile', 'guardian_mobile', 20),
+    ('schoolName', 'school_name', 100),
+    ('class1', 'class1', 20),
+    ('gpa1', 'gpa1', 10),
+    ('class2', 'class2', 20),
+    ('gpa2', 'gpa2', 10),
+    ('hobby', 'hobby', None),
+    ('correspondence', 'correspondence', None),
+    ('pastParticipant', 'past_participant', 5),
+    ('whyJoin', 'why_join', None),
+]
+CLUB_REGISTRATION_REQUIRED = ('fullName', 'email')
+CLUB_REGISTRATION_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Built once at import instead of per submission
+CLUB_REGISTRATION_INSERT = "INSERT INTO club_registrations ({}, clubs) VALUES ({}, %s)".format(
+    ', '.join(column for _, column, _ in CLUB_REGISTRATION_FIELDS),
+    ', '.join(['%s'] * len(CLUB_REGISTRATION_FIELDS))
+)
+CLUB_REGISTRATION_LIMITS = [(key, limit) for key, _, limit in CLUB_REGISTRATION_FIELDS if limit]
+# club_memberships.club and club_registrations.clubs column sizes
+CLUB_NAME_MAX_CHARS = 100
+CLUBS_MAX_CHARS = 255
+
+# Validate a submission and return (insert params, None) or (None, error message)
+def build_club_registration_params(data):
+    for field in CLUB_REGISTRATION_REQUIRED:
+        if not data.get(field):
+            return None, f"Missing required field: {field}"
+    if not isinstance(data['email'], str) or not CLUB_REGISTRATION_EMAIL_RE.fullmatch(data['email']):
+        return None, "Please provide a valid email address"
+    for key, limit in CLUB_REGISTRATION_LIMITS:
+        value = data.get(key)
+        if value is not None and len(str(value)) > limit:
+            return None, f"Field {key} must be at most {limit} characters"
+    
+    clubs = data.get('clubs') or []
+    if not isinstance(clubs, list):
+        return None, "clubs must be a list"
+    if not all(isinstance(club, str) and club.strip() and len(club.strip()) <= CLUB_NAME_MAX_CHARS
+               and ',' not in club for club in clubs):
+        return None, f"Each club must be a name of at most {CLUB_NAME_MAX_CHARS} characters without commas"
+    clubs = [club.strip() for club in clubs]
+    
+    params = [data.get(key) or (None if key == 'dateOfBirth' else '') for key, _, _ in CLUB_REGISTRATION_FIELDS]
+    # Process clubs array into comma-separated string
+    clubs_value = ','.join(clubs)
+    if len(clubs_value) > CLUBS_MAX_CHARS:
+        return None, f"clubs must be at most {CLUBS_MAX_CHARS} characters in total"
+    params.append(clubs_value)
+    return (tuple(params), clubs), None
+
+# Insert a registration and its club_memberships rows; returns the registration id
+def insert_club_registration(cursor, row):
+    params, clubs = row
+    cursor.execute(CLUB_REGISTRATION_INSERT, params)
+    registration_id = cursor.lastrowid
+    memberships = {str(club).strip() for club in clubs} - {''}
+    if memberships:
+        cursor.executemany(
+            "INSERT INTO club_memberships (registration_id, club) VALUES (%s, %s)",
+            [(registration_id, club) for club in sorted(memberships)]
+        )
+    return registration_id
+
+# Optional write-behind queue for admission season: submissions are group-committed in batches
+club_registration_writer = None
+if os.environ.get("CLUB_REGISTRATION_WRITE_BEHIND") == "1":
+    club_registration_writer = GroupCommitWriter(
+        'club_registrations',
+        lambda: get_db_connection(readonly=False),
+        insert_club_registration,
+        batch_size=int(os.environ.get("CLUB_REGISTRATION_BATCH_SIZE", 50)),
+        max_delay=float(os.environ.get("CLUB_REGISTRATION_BATCH_DELAY_MS", 10)) / 1000
+    )
+
+def is_duplicate_entry(error):
+    return isinstance(error, mysql.connector.IntegrityError) and error.errno == errorcode.ER_DUP_ENTRY
+
 @app.route('/api/club-registration', methods=['POST'])
 def submit_club_registration():
     """
     Submit a new club registration
     """
+    # Check if request has JSON data
+    if not request.is_json:
+        return jsonify({"error": "Request must be JSON"}), 400
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request must be JSON"}), 400
+    
+    row, validation_error = build_club_registration_params(data)
+    if validation_error:
+        return jsonify({"error": validation_error}), 400
+    
     try:
-        # Check if request has JSON data
-        if not request.is_json:
-            return jsonify({"error": "Request must be JSON"}), 400
-        
-        data = request.json
-        
-        # Validate required fields
-        required_fields = ['fullName', 'email']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
-        
-        # Process clubs array into comma-separated string
-        clubs = data.get('clubs', [])
-        clubs_str = ','.join(clubs) if clubs else ''
-        
-        # Connect to database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if email already exists
-        cursor.execute("SELECT id FROM club_registrations WHERE email = %s", (data['email'],))
-        existing = cursor.fetchone()
-        if existing:
-            conn.close()
-            return jsonify({"error": "A registration with this email already exists"}), 400
-        
-        # Insert new registration
-        query = """
-        INSERT INTO club_registrations (
-            form_no, registration_no, full_name, date_of_birth, place_of_birth,
-            gender, blood_group, religion, address, phone_no, email,
-            guardian_name, guardian_mobile, school_name, class1, gpa1,
-            class2, gpa2, hobby, correspondence, past_participant, why_join, clubs
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        cursor.execute(query, (
-            data.get('formNo', ''),
-            data.get('registrationNo', ''),
-            data['fullName'],
-            data.get('dateOfBirth', None),
-            data.get('placeOfBirth', ''),
-            data.get('gender', ''),
-            data.get('bloodGroup', ''),
-            data.get('religion', ''),
-            data.get('address', ''),
-            data.get('phoneNo', ''),
-            data['email'],
-            data.get('guardianName', ''),
-            data.get('guardianMobile', ''),
-            data.get('schoolName', ''),
-            data.get('class1', ''),
-            data.get('gpa1', ''),
-            data.get('class2', ''),
-            data.get('gpa2', ''),
-            data.get('hobby', ''),
-            data.get('correspondence', ''),
-            data.get('pastParticipant', ''),
-            data.get('whyJoin', ''),
-            clubs_str
-        ))
-        
-        conn.commit()
-        registration_id = cursor.lastrowid
-        conn.close()
+        # Email uniqueness is enforced by the UNIQUE(email) constraint, no pre-check needed
+        if club_registration_writer is not None:
+            registration_id = club_registration_writer.submit(row).result(timeout=30)
+        else:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            try:
+                registration_id = insert_club_registration(cursor, row)
+                conn.commit()
+            finally:
+                cursor.close()
+                conn.close()
         
         return jsonify({
             "success": True,
@@ -2238,10 +3510,27 @@ def submit_club_registration():
             "id": registration_id
         }), 201
         
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
+        if is_duplicate_entry(e):
+            return jsonify({"error": "A registration with this email already exists"}), 400
         print(f"Error in club registration: {str(e)}")
         return jsonify({"error": "Failed to submit registration"}), 500
 
+# Full registration rows keyed by column name, with the clubs string split back to an array
+CLUB_REGISTRATION_COLUMNS = ['id'] + [column for _, column, _ in CLUB_REGISTRATION_FIELDS] + ['clubs', 'created_at', 'updated_at']
+CLUB_REGISTRATION = Mapper('club_registration', [(f"cr.{column}", column) for column in CLUB_REGISTRATION_COLUMNS], {
+    column: "clubs.split(',') if clubs else []" if column == 'clubs' else column
+    for column in CLUB_REGISTRATION_COLUMNS
+})
+
+# ?page=N&pageSize=M, 1-based; returns (page, page_size, offset)
+def get_pagination_args(default_size=50, max_size=200):
+    page = max(request.args.get('page', 1, type=int), 1)
+    page_size = min(max(request.args.get('pageSize', default_size, type=int), 1), max_size)
+    return page, page_size, (page - 1) * page_size
+
 @app.route('/api/club-registration', methods=['GET'])
 @login_required
 @admin_required
@@ -2251,29 +3540,17 @@ def get_club_registrations():
     """
     try:
         conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         
-        cursor.execute("SELECT * FROM club_registrations ORDER BY created_at DESC")
-        registrations = cursor.fetchall()
+        cursor.execute(f"SELECT {CLUB_REGISTRATION.select} FROM club_registrations cr ORDER BY cr.created_at DESC")
+        registrations = CLUB_REGISTRATION.all(cursor.fetchall())
+        cursor.close()
         conn.close()
         
-        # Process clubs string back to array
-        for reg in registrations:
-            if reg['clubs']:
-                reg['clubs'] = reg['clubs'].split(',')
-            else:
-                reg['clubs'] = []
-                
-            # Format dates for JSON
-            if reg['date_of_birth']:
-                reg['date_of_birth'] = reg['date_of_birth'].isoformat()
-            if reg['created_at']:
-                reg['created_at'] = reg['created_at'].isoformat()
-            if reg['updated_at']:
-                reg['updated_at'] = reg['updated_at'].isoformat()
-        
         return jsonify(registrations), 200
         
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         print(f"Error fetching club registrations: {str(e)}")
         return jsonify({"error": "Failed to fetch registrations"}), 500
@@ -2287,34 +3564,242 @@ def get_club_registration(registration_id):
     """
     try:
         conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         
-        cursor.execute("SELECT * FROM club_registrations WHERE id = %s", (registration_id,))
-        registration = cursor.fetchone()
+        cursor.execute(f"SELECT {CLUB_REGISTRATION.select} FROM club_registrations cr WHERE cr.id = %s", (registration_id,))
+        registration = CLUB_REGISTRATION.one(cursor.fetchone())
+        cursor.close()
         conn.close()
         
         if not registration:
             return jsonify({"error": "Registration not found"}), 404
-            
-        # Process clubs string back to array
-        if registration['clubs']:
-            registration['clubs'] = registration['clubs'].split(',')
-        else:
-            registration['clubs'] = []
-            
-        # Format dates for JSON
-        if registration['date_of_birth']:
-            registration['date_of_birth'] = registration['date_of_birth'].isoformat()
-        if registration['created_at']:
-            registration['created_at'] = registration['created_at'].isoformat()
-        if registration['updated_at']:
-            registration['updated_at'] = registration['updated_at'].isoformat()
         
         return jsonify(registration), 200
         
+    except DatabaseUnavailable:
+        raise
     except Exception as e:
         print(f"Error fetching club registration: {str(e)}")
         return jsonify({"error": "Failed to fetch registration"}), 500
 
+@app.route('/api/club-registration/clubs', methods=['GET'])
+@login_required
+@admin_required
+def get_club_registration_counts():
+    """
+    Number of registrations per club (admin only)
+    """
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        
+        # Served from idx_club_memberships_club without touching club_registrations
+        cursor.execute("""
+            SELECT club, COUNT(*) as registrations
+            FROM club_memberships
+            GROUP BY club
+            ORDER BY club
+        """)
+        counts = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        
+        return jsonify(counts), 200
+        
+    except DatabaseUnavailable:
+        raise
+    except Exception as e:
+        print(f"Error fetching club counts: {str(e)}")
+        return jsonify({"error": "Failed to fetch club counts"}), 500
+
+@app.route('/api/club-registration/clubs/<club>', methods=['GET'])
+@login_required
+@admin_required
+def get_club_registrations_for_club(club):
+    """
+    Registrations for one club, newest first, paginated with ?page=&pageSize= (admin only)
+    """
+    page, page_size, offset = get_pagination_args()
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT COUNT(*) FROM club_memberships WHERE club = %s", (club,))
+        total = cursor.fetchone()[0]
+        
+        cursor.execute(f"""
+            SELECT {CLUB_REGISTRATION.select}
+            FROM club_memberships cm
+            JOIN club_registrations cr ON cr.id = cm.registration_id
+            WHERE cm.club = %s
+            ORDER BY cm.registration_id DESC
+            LIMIT %s OFFSET %s
+        """, (club, page_size, offset))
+        registrations = CLUB_REGISTRATION.all(cursor.fetchall())
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            "club": club,
+            "total": total,
+            "page": page,
+            "pageSize": page_size,
+            "registrations": registrations
+        }), 200
+        
+    except DatabaseUnavailable:
+        raise
+    except Exception as e:
+        print(f"Error fetching registrations for club {club}: {str(e)}")
+        return jsonify({"error": "Failed to fetch registrations"}), 500
+
+CLUB_REGISTRATION_SEARCH_MIN_CHARS = 2
+CLUB_REGISTRATION_PREFIX_COLUMNS = ('full_name', 'school_name', 'phone_no', 'registration_no', 'email')
+FULLTEXT_WORD_RE = re.compile(r'\w{3,}')  # InnoDB skips words shorter than innodb_ft_min_token_size (3)
+
+# Ids of registrations matching q: a prefix of any looked-up column, or every
+# word (as a word prefix) in name/school. Each UNION branch reads one index,
+# where a single OR'ed WHERE would scan the table.
+def club_registration_match(q):
+    branches = [f"SELECT id FROM club_registrations WHERE {column} LIKE %s" for column in CLUB_REGISTRATION_PREFIX_COLUMNS]
+    params = [like_prefix(q)] * len(branches)
+    words = FULLTEXT_WORD_RE.findall(q)
+    if words:
+        branches.append("SELECT id FROM club_registrations WHERE MATCH(full_name, school_name) AGAINST (%s IN BOOLEAN MODE)")
+        params.append(' '.join(f"+{word}*" for word in words))
+    return ' UNION '.join(branches), params
+
+@app.route('/api/club-registration/search', methods=['GET'])
+@login_required
+@admin_required
+def search_club_registrations():
+    """
+    Search registrations (admin only): ?q= matches the start of full name, school,
+    phone, registration number or email, or words in name/school. Filter with
+    ?gender=, ?bloodGroup= and ?club= (repeatable, any of), page with ?page=&pageSize=.
+    Newest first.
+    """
+    q = (request.args.get('q') or '').strip()
+    if q and len(q) < CLUB_REGISTRATION_SEARCH_MIN_CHARS:
+        return jsonify({"error": f"Search term must be at least {CLUB_REGISTRATION_SEARCH_MIN_CHARS} characters"}), 400
+    gender = request.args.get('gender') or None
+    blood_group = request.args.get('bloodGroup') or None
+    clubs = [club for club in request.args.getlist('club') if club]
+    page, page_size, offset = get_pagination_args()
+    
+    # Drive the query from the most selective source: search hits, then club
+    # memberships, else the registrations themselves through the filter indexes
+    source, params = "club_registrations cr", []
+    conditions = []
+    club_placeholders = ', '.join(['%s'] * len(clubs))
+    if q:
+        match, params = club_registration_match(q)
+        source = f"({match}) hits JOIN club_registrations cr ON cr.id = hits.id"
+        if clubs:
+            conditions.append(f"EXISTS (SELECT 1 FROM club_memberships cm "
+                              f"WHERE cm.registration_id = cr.id AND cm.club IN ({club_placeholders}))")
+            params += clubs
+    elif clubs:
+        source = (f"(SELECT DISTINCT registration_id AS id FROM club_memberships WHERE club IN ({club_placeholders})) hits "
+                  "JOIN club_registrations cr ON cr.id = hits.id")
+        params = list(clubs)
+    if gender:
+        conditions.append("cr.gender = %s")
+        params.append(gender)
+    if blood_group:
+        conditions.append("cr.blood_group = %s")
+        params.append(blood_group)
+    where = ' AND '.join(conditions) or 'TRUE'
+    
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", tuple(params))
+        total = cursor.fetchone()[0]
+        
+        cursor.execute(f"""
+            SELECT {CLUB_REGISTRATION.select}
+            FROM {source}
+            WHERE {where}
+            ORDER BY cr.id DESC
+            LIMIT %s OFFSET %s
+        """, tuple(params) + (page_size, offset))
+        registrations = CLUB_REGISTRATION.all(cursor.fetchall())
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            "total": total,
+            "page": page,
+            "pageSize": page_size,
+            "registrations": registrations
+        }), 200
+        
+    except DatabaseUnavailable:
+        raise
+    except Exception as e:
+        print(f"Error searching club registrations: {str(e)}")
+        return jsonify({"error": "Failed to search registrations"}), 500
+
+# Apply pending schema migrations: flask --app app migrate
+@app.cli.command('migrate')
+def migrate_command():
+    db = get_db_connection(readonly=False)
+    try:
+        applied = apply_migrations(db)
+    finally:
+        db.close()
+    print(f"Applied {len(applied)} migration(s)" if applied else "Database schema is up to date")
+
+# Recompute derived blog fields (HTML, excerpt, counts): flask --app app reprocess-blog-posts
+# Only generated excerpts are replaced; use --all to reprocess rows that already have content_html.
+@app.cli.command('reprocess-blog-posts')
+@click.option('--all', 'reprocess_all', is_flag=True, help='Also reprocess posts that were already processed.')
+@click.option('--batch-size', default=100, show_default=True)
+def reprocess_blog_posts_command(reprocess_all, batch_size):
+    db = get_db_connection(readonly=False)
+    read_cursor = db.cursor(dictionary=True, buffered=True)
+    write_cursor = db.cursor()
+    last_id = 0
+    processed = 0
+    try:
+        while True:
+            read_cursor.execute(f"""
+                SELECT id, content, excerpt, content_html, search_body
+                FROM blog_posts
+                WHERE id > %s {'' if reprocess_all else 'AND content_html IS NULL'}
+                ORDER BY id
+                LIMIT %s
+            """, (last_id, batch_size))
+            posts = read_cursor.fetchall()
+            if not posts:
+                break
+            for post in posts:
+                # Keep hand-written excerpts; regenerate ones we generated before
+                excerpt = post['excerpt']
+                if post['search_body'] is not None and excerpt == make_excerpt(post['search_body']):
+                    excerpt = None
+                derived = process_post(post['content'], excerpt)
+                write_cursor.execute("""
+                    UPDATE blog_posts
+                    SET content_html = %s, search_body = %s, word_count = %s, read_time = %s, excerpt = %s
+                    WHERE id = %s
+                """, (derived['content_html'], derived['search_body'], derived['word_count'],
+                      derived['read_time'], derived['excerpt'], post['id']))
+            db.commit()
+            processed += len(posts)
+            last_id = posts[-1]['id']
+            print(f"Processed {processed} blog post(s)")
+    finally:
+        read_cursor.close()
+        write_cursor.close()
+        db.close()
+    print(f"Done, {processed} blog post(s) reprocessed")
+
 if __name__ == '__main__':
+    # With the debug reloader, only the child process that serves requests warms up
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_warm_up()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,339 @@
+"""
+In-process caches shared by the request handlers.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# All caches by name, so they can be inspected/cleared in one place
+caches = {}
+
+class TTLCache:
+    """
+    Thread-safe LRU cache. Entries expire after `ttl` seconds (None = never)
+    and the least recently used entry is evicted once `maxsize` is reached.
+    """
+
+    def __init__(self, name, maxsize=1024, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+class Refresher:
+    """Runs background refreshes, at most one per key at a time."""
+
+    def __init__(self, name):
+        self.name = name
+        self.refreshes = 0
+        self.failures = 0
+        self._running = set()
+        self._lock = threading.Lock()
+
+    def claim(self, key):
+        """True if no refresh of `key` is running; the caller must release() it."""
+        with self._lock:
+            if key in self._running:
+                return False
+            self._running.add(key)
+            return True
+
+    def release(self, key):
+        with self._lock:
+            self._running.discard(key)
+
+    def start(self, key, refresh, on_error=None):
+        """
+        Run refresh() in a background thread unless `key` is already being
+        refreshed; on_error() is called if it raises.
+        """
+        if not self.claim(key):
+            return False
+
+        def run():
+            try:
+                refresh()
+                self.refreshes += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"Background refresh of {self.name} {key!r} failed: {e}")
+                if on_error is not None:
+                    on_error()
+            finally:
+                self.release(key)
+
+        threading.Thread(target=run, name=f"refresh-{self.name}", daemon=True).start()
+        return True
+
+class Snapshot:
+    """
+    A dataset as loaded, with its response body encoded once. `failed` is
+    set when rebuilding it failed, so it is being served past its age.
+    """
+    __slots__ = ('data', 'body', 'etag', 'built_at', 'failed')
+
+    def __init__(self, data, body):
+        self.data = data
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.built_at = time.monotonic()
+        self.failed = False
+
+    @property
+    def age(self):
+        return time.monotonic() - self.built_at
+
+class SnapshotStore:
+    """
+    Near-static datasets held as ready-to-send responses.
+
+    Each dataset is registered with a loader (db -> data). Its snapshot keeps
+    the data together with the encoded body and an ETag, so serving it takes
+    no query and no encoding. Snapshots are never modified: rebuild() loads
+    and encodes a new one and swaps it in with a single assignment, so a
+    reader sees the old snapshot or the new one, never a mix. Builds are
+    serialized, so an older rebuild can't finish last and win. A snapshot
+    older than `max_age` seconds (None = never) is still served while a
+    background rebuild replaces it; that is how writes made by other
+    processes show up. If that rebuild fails, the old snapshot stays and
+    is marked failed until a rebuild succeeds.
+    """
+
+    def __init__(self, name, encode, max_age=None):
+        self.name = name
+        self.encode = encode
+        self.max_age = max_age
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.refresher = Refresher(name)
+        self._loaders = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def register(self, key, load):
+        self._loaders[key] = load
+        return key
+
+    def get(self, key, connect):
+        """
+        The key's snapshot, built on a connection from connect() if missing.
+        One older than max_age is returned as is and rebuilt in the background.
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            with self._lock:
+                # Another thread may have built it while we waited
+                snapshot = self._snapshots.get(key)
+                if snapshot is None:
+                    self.misses += 1
+                    return self._build_with(key, connect)
+        if self.max_age is not None and snapshot.age >= self.max_age:
+            self.stale_hits += 1
+            self.refresher.start(key, lambda: self._refresh(key, connect), lambda: self._mark_failed(snapshot))
+        else:
+            self.hits += 1
+        return snapshot
+
+    def _refresh(self, key, connect):
+        with self._lock:
+            self._build_with(key, connect)
+
+    def _mark_failed(self, snapshot):
+        snapshot.failed = True
+
+    def _build_with(self, key, connect):
+        db = connect()
+        try:
+            return self._build(key, db)
+        finally:
+            db.close()
+
+    def rebuild(self, key, db):
+        """Load and swap in a new snapshot, e.g. right after the write that changed it committed."""
+        with self._lock:
+            return self._build(key, db)
+
+    def _build(self, key, db):
+        data = self._loaders[key](db)
+        snapshot = Snapshot(data, self.encode(data))
+        self._snapshots[key] = snapshot
+        self.builds += 1
+        return snapshot
+
+    def delete(self, key):
+        self._snapshots.pop(key, None)
+
+    def clear(self):
+        self._snapshots = {}
+
+    def stats(self):
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        return {
+            "size": len(self._snapshots),
+            "builds": self.builds,
+            "bytes": sum(len(snapshot.body) for snapshot in list(self._snapshots.values())),
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refresher.refreshes,
+            "refreshFailures": self.refresher.failures,
+            "hitRate": round(served / lookups, 4) if lookups else None
+        }
+
+class CachedResponse:
+    """
+    A response body with the headers to send it with. `expired` forces a
+    refresh before it is served again; `failed` is set when a refresh failed,
+    so it is being served past its age.
+    """
+    __slots__ = ('body', 'headers', 'etag', 'built_at', 'expired', 'failed')
+
+    def __init__(self, body, headers):
+        self.body = body
+        self.headers = headers
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.built_at = time.monotonic()
+        self.expired = False
+        self.failed = False
+
+    @property
+    def age(self):
+        return time.monotonic() - self.built_at
+
+class ResponseCache:
+    """
+    Last good response per key, served stale-while-revalidate.
+
+    lookup() classifies the stored response: 'fresh' for `fresh_seconds`,
+    then 'stale' (serve it and refresh in the background) until `max_age`,
+    then 'expired' (refresh before answering). When a refresh fails, the
+    caller serves the last good response anyway, however old, so trouble
+    with the database only shows for keys that were never stored.
+    """
+
+    FRESH, STALE, EXPIRED = 'fresh', 'stale', 'expired'
+
+    def __init__(self, name, maxsize=1024, fresh_seconds=10, max_age=300):
+        self.name = name
+        self.maxsize = maxsize
+        self.fresh_seconds = fresh_seconds
+        self.max_age = max_age
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.refresher = Refresher(name)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def lookup(self, key):
+        """(response, state); (None, None) if nothing is stored for the key."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None
+            self._data.move_to_end(key)
+            age = entry.age
+            if entry.expired or age >= self.max_age:
+                return entry, self.EXPIRED
+            if age >= self.fresh_seconds:
+                self.stale_hits += 1
+                return entry, self.STALE
+            self.hits += 1
+            return entry, self.FRESH
+
+    def store(self, key, body, headers):
+        entry = CachedResponse(body, headers)
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return entry
+
+    def fail(self, key):
+        """Mark the key's stored response as served past a failed refresh."""
+        self.failures += 1
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is not None:
+            entry.failed = True
+
+    def expire(self, prefix):
+        """Refresh every key starting with `prefix` before serving it again."""
+        with self._lock:
+            for key, entry in self._data.items():
+                if key.startswith(prefix):
+                    entry.expired = True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refresher.refreshes,
+            "refreshFailures": self.failures,
+            "hitRate": round(served / lookups, 4) if lookups else None
+        }
@@ -0,0 +1,152 @@
+"""
+Write-time processing of blog post content.
+
+Everything a reader needs that can be derived from the Markdown source is
+computed once when a post is saved: sanitized HTML, plain text for search,
+word count, read time and a fallback excerpt.
+"""
+import html
+import re
+from html.parser import HTMLParser
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 200
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+    'th', 'thead', 'tr', 'ul'
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'img': {'src', 'alt', 'title'},
+    'code': {'class'},
+    'td': {'align'},
+    'th': {'align'},
+    'abbr': {'title'}
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_URL_SCHEMES = {'http', 'https', 'mailto'}
+# Elements whose content is dropped together with the tag
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template'}
+BLOCK_TAGS = {'p', 'br', 'li', 'tr', 'pre', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr'}
+
+def is_safe_url(url):
+    # Strip characters browsers ignore inside a scheme (e.g. "java\tscript:")
+    compact = re.sub(r'[\x00-\x20]', '', html.unescape(url)).lower()
+    scheme = compact.split(':', 1)[0] if ':' in compact.split('/', 1)[0] else None
+    return scheme is None or scheme in ALLOWED_URL_SCHEMES
+
+class Sanitizer(HTMLParser):
+    """Re-serializes HTML keeping only allow-listed tags, attributes and URL schemes."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = ''
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            rendered += f' {name}="{html.escape(value, quote=True)}"'
+        if tag == 'a':
+            rendered += ' rel="nofollow noopener"'
+        self.output.append(f'<{tag}{rendered}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        # Close anything left open inside this element
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.output.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.output.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.output) + ''.join(f'</{tag}>' for tag in reversed(self.open_tags))
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+def render_markdown(source):
+    if markdown is not None:
+        return markdown.markdown(source, extensions=['extra', 'sane_lists'], output_format='html')
+    # Without the markdown package, publish escaped paragraphs
+    paragraphs = re.split(r'\n\s*\n', source.strip())
+    return '\n'.join(f"<p>{html.escape(p).replace(chr(10), '<br>')}</p>" for p in paragraphs if p.strip())
+
+def sanitize_html(unsafe_html):
+    sanitizer = Sanitizer()
+    sanitizer.feed(unsafe_html)
+    return sanitizer.result()
+
+def html_to_text(safe_html):
+    extractor = TextExtractor()
+    extractor.feed(safe_html)
+    extractor.close()
+    return ' '.join(''.join(extractor.parts).split())
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0]
+    return cut.rstrip(' ,.;:') + '…'
+
+def process_post(content, excerpt=None):
+    """Derived columns for a blog post, keyed by column name."""
+    content_html = sanitize_html(render_markdown(content or ''))
+    search_body = html_to_text(content_html)
+    word_count = len(search_body.split())
+    return {
+        "content_html": content_html,
+        "search_body": search_body,
+        "word_count": word_count,
+        "read_time": f"{max(1, round(word_count / WORDS_PER_MINUTE))} min read",
+        "excerpt": excerpt if excerpt else make_excerpt(search_body)
+    }
@@ -0,0 +1,179 @@
+"""
+Local image pipeline: stores uploaded originals, renders resized WebP/JPEG
+variants and initials-based avatars. Rendering runs in a process pool, so
+the CPU-heavy work doesn't hold the server process's GIL; the requesting
+thread still waits for its own result.
+
+Files are named after a hash of their content (or, for initials avatars, of
+everything that determines their pixels), so every URL is immutable.
+Pillow is optional; without it `available()` is False and callers keep the
+original image URLs.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
+except ImportError:
+    Image = None
+
+MEDIA_ROOT = os.environ.get("MEDIA_ROOT") or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'media')
+ORIGINALS_DIR = os.path.join(MEDIA_ROOT, 'originals')
+VARIANTS_DIR = os.path.join(MEDIA_ROOT, 'variants')
+
+# Widths rendered for every upload; smaller originals are never upscaled
+VARIANT_WIDTHS = (64, 128, 256, 480, 960, 1600)
+FORMATS = {'webp': ('WEBP', 'image/webp'), 'jpg': ('JPEG', 'image/jpeg')}
+
+AVATAR_COLORS = ('1abc9c', '3498db', '9b59b6', 'e67e22', 'e74c3c', '16a085', '2c3e50', 'd35400')
+# Sizes initials avatars are rendered at; anything else is not a URL we hand out
+AVATAR_WIDTHS = (64, 128, 256)
+
+def available():
+    return Image is not None
+
+def variant_filename(key, width, extension):
+    return f"{key}-{width}.{extension}"
+
+# --- Runs in worker processes ---------------------------------------------
+
+def _save_variants(image, key, widths):
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    for width in widths:
+        resized = image
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+        resized.save(os.path.join(VARIANTS_DIR, variant_filename(key, width, 'webp')), 'WEBP', quality=82, method=4)
+        # JPEG has no alpha channel; flatten onto white
+        flat = resized
+        if resized.mode == 'RGBA':
+            flat = Image.new('RGB', resized.size, (255, 255, 255))
+            flat.paste(resized, mask=resized.split()[3])
+        flat.save(os.path.join(VARIANTS_DIR, variant_filename(key, width, 'jpg')), 'JPEG', quality=82, optimize=True, progressive=True)
+
+def render_variants(original_path, key, widths=VARIANT_WIDTHS):
+    os.makedirs(VARIANTS_DIR, exist_ok=True)
+    with Image.open(original_path) as image:
+        _save_variants(image, key, widths)
+    return key
+
+def render_initials_avatar(initials, color, size, key):
+    os.makedirs(VARIANTS_DIR, exist_ok=True)
+    # Draw at 4x and downsample for smooth edges
+    scale = 4
+    canvas = Image.new('RGBA', (size * scale, size * scale), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(canvas)
+    draw.ellipse((0, 0, size * scale - 1, size * scale - 1), fill='#' + color)
+    try:
+        font = ImageFont.load_default(size=int(size * scale * 0.42))
+    except TypeError:
+        # Pillow < 10.1 has no scalable default font
+        font = ImageFont.load_default()
+    draw.text((size * scale / 2, size * scale / 2), initials, fill='white', font=font, anchor='mm')
+    _save_variants(canvas.resize((size, size), Image.LANCZOS), key, (size,))
+    return key
+
+# --- Request side ---------------------------------------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: never fork a multi-threaded server process
+                _pool = ProcessPoolExecutor(
+                    max_workers=int(os.environ.get("IMAGE_WORKERS", 2)),
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _pool
+
+def run_in_pool(fn, *args):
+    """Run fn(*args) in the pool and wait for it; a broken pool is replaced once."""
+    global _pool
+    for attempt in (1, 2):
+        pool = get_pool()
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            with _pool_lock:
+                if _pool is pool:
+                    _pool = None
+            pool.shutdown(wait=False)
+            if attempt == 2:
+                raise
+
+def store_upload(data):
+    """
+    Store an uploaded image and render its variants. Returns the content key;
+    raises ValueError when the data is not an image Pillow can read.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+            extension = (image.format or 'bin').lower()
+    except Exception as e:
+        raise ValueError(f"Unsupported image: {e}")
+
+    key = hashlib.sha256(data).hexdigest()[:20]
+    os.makedirs(ORIGINALS_DIR, exist_ok=True)
+    original_path = os.path.join(ORIGINALS_DIR, f"{key}.{extension}")
+    if not os.path.exists(original_path):
+        with open(original_path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(original_path + '.tmp', original_path)
+    if not os.path.exists(os.path.join(VARIANTS_DIR, variant_filename(key, VARIANT_WIDTHS[-1], 'jpg'))):
+        run_in_pool(render_variants, original_path, key)
+    return key
+
+def valid_initials(initials):
+    return initials == '?' or (1 <= len(initials) <= 2 and initials.isalnum() and initials == initials.upper())
+
+def initials_for(name):
+    # Letters and digits only ("O'Neil" -> "ON", "J." -> "J"), so every key parses back
+    words = [''.join(char for char in word if char.isalnum()) for word in (name or '').split()]
+    words = [word for word in words if word]
+    if not words:
+        return '?'
+    if len(words) == 1:
+        initials = words[0][:2].upper()[:2]
+    else:
+        initials = (words[0][0] + words[-1][0]).upper()[:2]
+    return initials if valid_initials(initials) else '?'
+
+def initials_avatar_key(name):
+    initials = initials_for(name)
+    color = AVATAR_COLORS[int(hashlib.md5((name or '').encode()).hexdigest(), 16) % len(AVATAR_COLORS)]
+    return f"i{color}{initials.encode().hex()}"
+
+def parse_initials_key(key):
+    """(initials, color) for a key initials_avatar_key() can produce, else None."""
+    if not key.startswith('i') or len(key) < 8 or key[1:7] not in AVATAR_COLORS:
+        return None
+    try:
+        initials = bytes.fromhex(key[7:]).decode()
+    except ValueError:
+        return None
+    if not valid_initials(initials):
+        return None
+    return initials, key[1:7]
+
+def ensure_initials_avatar(key, size):
+    """Render an initials avatar variant on first request; returns False for unknown keys."""
+    parsed = parse_initials_key(key)
+    if parsed is None or size not in AVATAR_WIDTHS:
+        return False
+    if not os.path.exists(os.path.join(VARIANTS_DIR, variant_filename(key, size, 'jpg'))):
+        initials, color = parsed
+        run_in_pool(render_initials_avatar, initials, color, size, key)
+    return True
@@ -0,0 +1,87 @@
+"""
+Write-behind queue that group-commits submissions.
+
+Requests hand their row to the writer and wait on a Future. A background
+thread drains the queue in batches and writes each batch in one transaction,
+so N concurrent submissions cost one COMMIT (and one log flush) instead of N.
+Each row runs inside its own savepoint, so a row whose statements fail
+partway (e.g. a duplicate key on its second insert) is rolled back whole and
+only fails its own Future; the rest of the batch commits.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+class GroupCommitWriter:
+    def __init__(self, name, connect, write_row, batch_size=50, max_delay=0.01):
+        self.name = name
+        self.connect = connect
+        self.write_row = write_row
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.batches_written = 0
+        self.rows_written = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"writer-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        future = Future()
+        self._queue.put((row, future))
+        return future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        # Give concurrent submissions a moment to join this batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get(timeout=self.max_delay))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            except Exception as e:
+                print(f"Write-behind batch failed in {self.name}: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _write(self, batch):
+        db = self.connect()
+        cursor = db.cursor()
+        try:
+            results = []
+            for row, future in batch:
+                # A row may take several statements; undo all of them if one fails
+                cursor.execute("SAVEPOINT write_row")
+                try:
+                    result = self.write_row(cursor, row)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT write_row")
+                    results.append((future, None, e))
+                else:
+                    cursor.execute("RELEASE SAVEPOINT write_row")
+                    results.append((future, result, None))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cursor.close()
+            db.close()
+
+        self.batches_written += 1
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                self.rows_written += 1
+                future.set_result(result)
@@ -0,0 +1,56 @@
+"""
+Compiled row-to-response mappers.
+
+Handlers read rows from plain (tuple) cursors and turn them into response
+dicts with a Mapper built once at import time. A Mapper owns the SELECT
+column list for its resource and generates a function that unpacks the row
+tuple positionally and builds the response in a single dict display, so a row
+costs only the dicts that end up in the JSON: no dictionary-cursor row, no
+per-field lookups by name.
+
+    AUTHOR = {"id": "str(author_id)", "name": "author_name"}
+    POST = Mapper('post', [('bp.id', 'id'), ('u.id', 'author_id'), ('u.name', 'author_name')],
+                  {"id": "str(id)", "author": AUTHOR})
+    cursor.execute(f"SELECT {POST.select} FROM ...")
+    posts = POST.all(cursor.fetchall())
+
+Shape values are Python expressions over the column aliases (and any
+helpers passed in); nested dicts become nested objects.
+"""
+import keyword
+
+def _render(shape):
+    if isinstance(shape, dict):
+        return '{' + ', '.join(f"{key!r}: {_render(value)}" for key, value in shape.items()) + '}'
+    return f"({shape})"
+
+class Mapper:
+    def __init__(self, name, columns, shape, helpers=None):
+        self.name = name
+        self.columns = tuple(alias for _, alias in columns)
+        for alias in self.columns:
+            if not alias.isidentifier() or keyword.iskeyword(alias):
+                raise ValueError(f"Mapper {name}: column alias {alias!r} is not a valid identifier")
+        # "bp.title" selected as "title" needs no alias
+        self.select = ', '.join(
+            expression if expression.rsplit('.', 1)[-1] == alias else f"{expression} AS {alias}"
+            for expression, alias in columns
+        )
+        self.source = (
+            f"def map_{name}(row):\n"
+            f"    {', '.join(self.columns)}, = row\n"
+            f"    return {_render(shape)}\n"
+        )
+        namespace = dict(helpers or {})
+        exec(compile(self.source, f"<mapper {name}>", 'exec'), namespace)
+        self.map = namespace[f"map_{name}"]
+
+    def index(self, alias):
+        """Position of a column in the row, for values read outside the shape."""
+        return self.columns.index(alias)
+
+    def one(self, row):
+        return None if row is None else self.map(row)
+
+    def all(self, rows):
+        return list(map(self.map, rows))
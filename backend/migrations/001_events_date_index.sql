@@ -0,0 +1,2 @@
+-- Calendar views query events by date window; keep that an index range scan
+CREATE INDEX idx_events_date_id ON events (date, id);
@@ -0,0 +1,25 @@
+-- One row per (registration, club) so per-club listings and counts use an index
+-- instead of scanning club_registrations.clubs with LIKE
+CREATE TABLE club_memberships (
+  registration_id int(11) NOT NULL,
+  club varchar(100) NOT NULL,
+  PRIMARY KEY (registration_id, club),
+  KEY idx_club_memberships_club (club, registration_id),
+  CONSTRAINT club_memberships_ibfk_1 FOREIGN KEY (registration_id) REFERENCES club_registrations (id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Backfill from the comma-separated clubs column (up to 64 clubs per registration)
+INSERT IGNORE INTO club_memberships (registration_id, club)
+SELECT id, club FROM (
+  SELECT cr.id, TRIM(SUBSTRING_INDEX(SUBSTRING_INDEX(cr.clubs, ',', n.n), ',', -1)) AS club
+  FROM club_registrations cr
+  JOIN (
+    SELECT a.d * 8 + b.d + 1 AS n
+    FROM (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+          UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7) a
+    CROSS JOIN (SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+          UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7) b
+  ) n ON n.n <= 1 + LENGTH(cr.clubs) - LENGTH(REPLACE(cr.clubs, ',', ''))
+  WHERE cr.clubs IS NOT NULL AND cr.clubs <> ''
+) split
+WHERE club <> '';
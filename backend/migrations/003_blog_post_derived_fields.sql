@@ -0,0 +1,8 @@
+-- Fields derived from blog_posts.content at write time (see content.py).
+-- Run `flask --app app reprocess-blog-posts` afterwards to fill existing rows.
+ALTER TABLE blog_posts
+  ADD COLUMN content_html MEDIUMTEXT NULL,
+  ADD COLUMN search_body MEDIUMTEXT NULL,
+  ADD COLUMN word_count INT NOT NULL DEFAULT 0;
+
+CREATE FULLTEXT INDEX ft_blog_posts_search ON blog_posts (title, search_body);
@@ -0,0 +1,20 @@
+-- Forum index ordered by last activity (GET /api/forum). Maintained on every
+-- reply so the front page is a backward scan of one index, not a GROUP BY over
+-- forum_replies. last_reply_at is the time of the latest reply, or the
+-- creation time until the first one.
+ALTER TABLE forum_posts
+  ADD COLUMN last_reply_at timestamp NOT NULL DEFAULT current_timestamp(),
+  ADD COLUMN reply_count int(11) NOT NULL DEFAULT 0;
+
+-- updated_at = updated_at keeps ON UPDATE current_timestamp() from touching it
+UPDATE forum_posts fp
+LEFT JOIN (
+  SELECT forum_post_id, COUNT(*) AS replies, MAX(created_at) AS last_reply
+  FROM forum_replies
+  GROUP BY forum_post_id
+) fr ON fr.forum_post_id = fp.id
+SET fp.reply_count = COALESCE(fr.replies, 0),
+    fp.last_reply_at = COALESCE(fr.last_reply, fp.created_at),
+    fp.updated_at = fp.updated_at;
+
+CREATE INDEX idx_forum_posts_activity ON forum_posts (last_reply_at, id);
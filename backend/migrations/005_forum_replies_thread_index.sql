@@ -0,0 +1,6 @@
+-- Reply pages within a thread (GET /api/forum/<id>/replies) seek on
+-- (forum_post_id, created_at, id) in either direction. The new index also
+-- serves the foreign key, so the single-column one goes.
+ALTER TABLE forum_replies
+  ADD INDEX idx_forum_replies_thread (forum_post_id, created_at, id),
+  DROP INDEX forum_post_id;
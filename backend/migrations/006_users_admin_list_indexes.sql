@@ -0,0 +1,8 @@
+-- Admin user list (GET /api/users): each filter/sort combination reads one
+-- index. The page of ids is picked from the index alone (InnoDB secondary
+-- indexes carry the primary key) before the rows themselves are read.
+CREATE INDEX idx_users_created ON users (created_at);
+CREATE INDEX idx_users_role_created ON users (role, created_at);
+CREATE INDEX idx_users_status_created ON users (status, created_at);
+-- Name prefix search and name ordering; email prefix search uses the UNIQUE key
+CREATE INDEX idx_users_name ON users (name);
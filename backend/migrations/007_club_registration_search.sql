@@ -0,0 +1,12 @@
+-- Admin search over club registrations (GET /api/club-registration/search).
+-- Every search branch is an index lookup: prefixes on the looked-up columns
+-- (email already has its UNIQUE key) and words anywhere in name or school.
+CREATE INDEX idx_club_registrations_full_name ON club_registrations (full_name);
+CREATE INDEX idx_club_registrations_school_name ON club_registrations (school_name);
+CREATE INDEX idx_club_registrations_phone_no ON club_registrations (phone_no);
+CREATE INDEX idx_club_registrations_registration_no ON club_registrations (registration_no);
+CREATE FULLTEXT INDEX ft_club_registrations_search ON club_registrations (full_name, school_name);
+
+-- Filter-only listings, newest first (secondary indexes end in id)
+CREATE INDEX idx_club_registrations_gender ON club_registrations (gender, blood_group);
+CREATE INDEX idx_club_registrations_blood_group ON club_registrations (blood_group);
@@ -0,0 +1,107 @@
+"""
+Publish/subscribe fan-out for live updates (Server-Sent Events).
+
+Handlers publish to a channel after their transaction commits; every open
+stream subscribed to that channel receives the message. Delivery between
+worker processes goes through a replaceable backend: the default only fans
+out inside this process, RedisBackend relays through Redis pub/sub.
+"""
+import json
+import os
+import queue
+import threading
+from datetime import date, datetime
+
+def _encode(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class InProcessBackend:
+    """Delivers messages to subscribers of this process only."""
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, channel, message):
+        self._deliver(channel, message)
+
+class RedisBackend:
+    """Relays messages through Redis so every worker's subscribers receive them."""
+
+    def __init__(self, url, prefix='sciencehub:'):
+        import redis  # Optional dependency, only needed for this backend
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def start(self, deliver):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(self.prefix + '*')
+
+        def listen():
+            for item in pubsub.listen():
+                channel = item['channel'].decode()[len(self.prefix):]
+                deliver(channel, json.loads(item['data']))
+
+        threading.Thread(target=listen, name='pubsub-redis', daemon=True).start()
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel, json.dumps(message, default=_encode))
+
+class Subscription:
+    def __init__(self, channel, maxsize):
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class Broker:
+    def __init__(self, backend=None, queue_size=100):
+        self.backend = backend or InProcessBackend()
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self.backend.start(self._deliver)
+
+    def subscribe(self, channel):
+        subscription = Subscription(channel, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel, message):
+        try:
+            self.backend.publish(channel, message)
+        except Exception as e:
+            # Live updates are best effort; never fail the write that triggered them
+            print(f"Failed to publish to {channel}: {e}")
+
+    def _deliver(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                # Slow reader: drop the message rather than block the publisher
+                pass
+
+def create_broker():
+    redis_url = os.environ.get("PUBSUB_REDIS_URL")
+    return Broker(RedisBackend(redis_url) if redis_url else InProcessBackend())
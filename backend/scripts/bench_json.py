@@ -0,0 +1,103 @@
+"""
+Microbenchmark for response serialization.
+
+Builds payloads shaped like the blog list (nested author and tags) and the
+admin club registration export (datetime columns), then times the previous
+path -- formatting every date in Python and encoding with sorted keys through
+the stdlib -- against the app's JSON provider:
+
+    python scripts/bench_json.py --posts 500 --registrations 2000 --rounds 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as server  # noqa: E402
+
+def blog_posts(n):
+    # Rows in BLOG_POST_LIST_ITEM's column order, mapped and hydrated the way
+    # get_blog_posts() does, so the payload is exactly what /api/blog returns
+    published = datetime(2024, 1, 1, 9, 30)
+    content = "A paragraph of post content about the experiment and its results. " * 60
+    rows = [dict(
+        id=i,
+        title=f"Post number {i} about chemistry",
+        excerpt="A short summary of the post that is shown on the list page. " * 2,
+        content=content,
+        published_at=published + timedelta(hours=i),
+        read_time="4 min read",
+        word_count=812,
+        cover_image=f"/media/{i:020x}",
+        author_id=i % 40
+    ) for i in range(n)]
+    posts = server.BLOG_POST_LIST_ITEM.all(
+        [tuple(row[column] for column in server.BLOG_POST_LIST_ITEM.columns) for row in rows]
+    )
+    authors = {author_id: server.UserSummary(author_id, f"Author {author_id}", f"/media/{author_id:020x}", 'editor')
+               for author_id in range(40)}
+    for post, row in zip(posts, rows):
+        post['author'] = authors[row['author_id']].author
+        post['tags'] = ["chemistry", "lab", "students"]
+    return posts
+
+def club_registrations(n):
+    created = datetime(2024, 3, 1, 8, 0)
+    return [{
+        "id": i,
+        "form_no": f"F{i:05d}",
+        "registration_no": f"R{i:05d}",
+        "full_name": f"Student {i}",
+        "date_of_birth": date(2008, 1, 1) + timedelta(days=i % 700),
+        "gender": "Female" if i % 2 else "Male",
+        "blood_group": "O+",
+        "phone_no": "01700000000",
+        "email": f"student{i}@example.com",
+        "school_name": "Dhaka Science School",
+        "clubs": ["Science", "Math"],
+        "created_at": created + timedelta(minutes=i),
+        "updated_at": None
+    } for i in range(n)]
+
+def legacy_format(value):
+    # What handlers used to do before encoding: stringify dates field by field
+    if isinstance(value, dict):
+        return {k: legacy_format(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [legacy_format(v) for v in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def legacy_dumps(payload):
+    return json.dumps(legacy_format(payload), sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def timed(fn, payload, rounds):
+    fn(payload)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(payload)
+    return (time.perf_counter() - start) / rounds * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=500)
+    parser.add_argument('--registrations', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    provider = server.app.json
+    print(f"orjson: {'installed' if server.orjson is not None else 'not installed (stdlib fallback)'}")
+    for label, payload in (("blog list", blog_posts(args.posts)), ("club registrations", club_registrations(args.registrations))):
+        assert json.loads(legacy_dumps(payload)) == json.loads(provider.dumps_bytes(payload))
+        before = timed(legacy_dumps, payload, args.rounds)
+        after = timed(provider.dumps_bytes, payload, args.rounds)
+        size = len(provider.dumps_bytes(payload))
+        print(f"{label:<20} {size / 1024:8.1f} KiB  stdlib {before:7.2f} ms  provider {after:7.2f} ms  {before / after:5.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for the prepared-statement registry.
+
+Runs the hottest read statements against the configured database (DB_* /
+DB_PRIMARY_DSN, see DEPLOYMENT.md) on one connection, first as plain
+client-interpolated queries and then through db.statements, and reports the
+mean latency per execution together with how often the server had to parse a
+statement (Com_select for text queries, Com_stmt_prepare for prepared ones):
+
+    python scripts/bench_prepared_statements.py --iterations 2000 --user-id 1
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as server  # noqa: E402
+from db import router, statements  # noqa: E402
+
+def session_counters(db):
+    cursor = db.cursor()
+    cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN ('Com_select', 'Com_stmt_prepare', 'Com_stmt_execute')")
+    counters = {name: int(value) for name, value in cursor.fetchall()}
+    cursor.close()
+    return counters
+
+def run_plain(db, sql, params, iterations):
+    cursor = db.cursor()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        cursor.execute(sql, params)
+        cursor.fetchall()
+    elapsed = time.perf_counter() - start
+    cursor.close()
+    return elapsed
+
+def run_prepared(db, name, params, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        statements.fetchall(db, name, params)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--user-id', type=int, default=1)
+    args = parser.parse_args()
+
+    if not statements.enabled:
+        sys.exit("DB_PREPARED_STATEMENTS is off; nothing to compare")
+
+    cases = [
+        (server.AUTHOR_BY_ID, (args.user_id,)),
+        (server.USER_ROLE, (args.user_id,)),
+        (server.EVENT_LIST, (server.EVENTS_FIRST_DATE, server.EVENTS_LAST_DATE, server.EVENTS_NO_LIMIT)),
+        (server.UPCOMING_EVENTS, (server.DASHBOARD_RECENT_LIMIT,)),
+        (server.FORUM_POST_LIST, ()),
+    ]
+
+    db = router.connection(readonly=False)
+    try:
+        print(f"{'statement':<18} {'plain us':>10} {'prepared us':>12} {'speedup':>8}   server parses (plain / prepared)")
+        for name, params in cases:
+            sql = statements._sql[name]
+            before = session_counters(db)
+            plain = run_plain(db, sql, params, args.iterations)
+            middle = session_counters(db)
+            prepared = run_prepared(db, name, params, args.iterations)
+            after = session_counters(db)
+
+            # The counter query itself is one Com_select
+            plain_parses = middle['Com_select'] - before['Com_select'] - 1
+            prepared_parses = after['Com_stmt_prepare'] - middle['Com_stmt_prepare']
+            print(f"{name:<18} {plain / args.iterations * 1e6:10.1f} {prepared / args.iterations * 1e6:12.1f} "
+                  f"{plain / prepared:7.2f}x   {plain_parses} / {prepared_parses}")
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
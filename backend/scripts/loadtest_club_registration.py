@@ -0,0 +1,84 @@
+"""
+Load test for the club registration endpoint.
+
+Keeps --concurrency clients submitting unique registrations for --duration
+seconds and reports sustained submissions per second and latency percentiles.
+Run it against a server backed by a disposable database, e.g.:
+
+    python scripts/loadtest_club_registration.py --url http://localhost:5000 --concurrency 32 --duration 60
+
+Compare a run with CLUB_REGISTRATION_WRITE_BEHIND=1 on the server against one without.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+def submit(url, run_id, n):
+    payload = json.dumps({
+        "fullName": f"Load Test {n}",
+        "email": f"loadtest-{run_id}-{n}@example.com",
+        "schoolName": "Load Test School",
+        "gender": "Other",
+        "clubs": ["Science", "Math"]
+    }).encode()
+    req = urllib.request.Request(url + '/api/club-registration', data=payload,
+                                 headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    counter = iter(range(10 ** 9))
+    counter_lock = threading.Lock()
+    latencies = []
+    statuses = {}
+    results_lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def worker():
+        while time.monotonic() < deadline:
+            with counter_lock:
+                n = next(counter)
+            started = time.monotonic()
+            status = submit(args.url, run_id, n)
+            elapsed = time.monotonic() - started
+            with results_lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+
+    latencies.sort()
+    succeeded = statuses.get(201, 0)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+    print(f"Requests:        {len(latencies)} in {wall:.1f}s with {args.concurrency} clients")
+    print(f"Status codes:    {statuses}")
+    print(f"Throughput:      {succeeded / wall:.1f} successful submissions/s")
+    print(f"Latency p50/p95/p99: {percentile(0.50):.1f} / {percentile(0.95):.1f} / {percentile(0.99):.1f} ms")
+
+if __name__ == '__main__':
+    main()
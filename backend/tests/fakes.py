@@ -0,0 +1,61 @@
+"""
+In-memory stand-ins for the database router and its connections.
+"""
+from mysql.connector import errors
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        pass
+
+    def fetchall(self):
+        return list(self.connection.rows)
+
+    def fetchone(self):
+        return self.connection.rows[0] if self.connection.rows else None
+
+    def close(self):
+        self.closed = True
+
+class FakeConnection:
+    def __init__(self, fail_commit=False, rows=()):
+        self.fail_commit = fail_commit
+        # What every query on this connection returns
+        self.rows = list(rows)
+        self.cursors = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closes = 0
+
+    def cursor(self, **kwargs):
+        cursor = FakeCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        if self.fail_commit:
+            raise errors.OperationalError("Lost connection to MySQL server during query")
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closes += 1
+
+class FakeRouter:
+    def __init__(self, fail_commit=False, rows=()):
+        self.fail_commit = fail_commit
+        self.rows = rows
+        self.connections = []
+
+    def connection(self, readonly=False):
+        connection = FakeConnection(self.fail_commit, self.rows)
+        self.connections.append(connection)
+        return connection
+
+    def stats(self):
+        return {}
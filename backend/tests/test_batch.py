@@ -0,0 +1,33 @@
+"""
+/api/batch: every sub-request gets its own entry, even when a sibling fails.
+"""
+import app as app_module
+from fakes import FakeRouter
+
+def broken_handler():
+    app_module.get_db_connection().cursor()
+    raise RuntimeError("injected failure in a batched handler")
+
+def listing_handler():
+    cursor = app_module.get_db_connection().cursor()
+    cursor.execute("SELECT id FROM events")
+    return app_module.jsonify([row[0] for row in cursor.fetchall()])
+
+app_module.app.add_url_rule('/api/_test/broken', 'test_batch_broken', broken_handler)
+app_module.app.add_url_rule('/api/_test/listing', 'test_batch_listing', listing_handler)
+
+def test_failing_item_does_not_fail_the_batch(monkeypatch):
+    router = FakeRouter(rows=[(1,), (2,)])
+    monkeypatch.setattr(app_module, 'router', router)
+    response = app_module.app.test_client().post('/api/batch', json={
+        "requests": ['/api/_test/listing', '/api/_test/broken', {"path": '/api/_test/listing'}]
+    })
+    assert response.status_code == 200
+    assert response.get_json() == [
+        {"path": '/api/_test/listing', "status": 200, "body": [1, 2]},
+        {"path": '/api/_test/broken', "status": 500, "body": {"error": "Internal server error"}},
+        {"path": '/api/_test/listing', "status": 200, "body": [1, 2]}
+    ]
+    # The batch's one shared connection is still released
+    [connection] = router.connections
+    assert connection.closes == 1
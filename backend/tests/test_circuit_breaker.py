@@ -0,0 +1,41 @@
+"""
+CircuitBreaker: failures within the window open it, failures outside don't.
+"""
+import pytest
+
+import db
+from db import CircuitBreaker, DatabaseUnavailable
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(db.time, 'monotonic', clock.monotonic)
+    return clock
+
+def test_opens_after_threshold_failures_in_window(clock):
+    breaker = CircuitBreaker('primary', threshold=3, reset_seconds=10, window_seconds=30)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure(RuntimeError("timeout"))
+    with pytest.raises(DatabaseUnavailable):
+        breaker.before_call()
+
+def test_failures_that_all_aged_out_are_still_counted(clock):
+    breaker = CircuitBreaker('primary', threshold=2, reset_seconds=10, window_seconds=5)
+    breaker.record_failure(RuntimeError("timeout"))
+    clock.now += 60
+    breaker.record_failure(RuntimeError("timeout"))
+    assert breaker.failures == 2
+    assert breaker.stats()['recentFailures'] == 1
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_window_must_be_positive():
+    with pytest.raises(ValueError):
+        CircuitBreaker('primary', window_seconds=0)
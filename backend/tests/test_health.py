@@ -0,0 +1,43 @@
+"""
+/healthz and /readyz: pool, cache and request stats only for admins and
+monitoring holding the health token.
+"""
+import pytest
+
+import app as app_module
+from fakes import FakeRouter
+
+def signed_in_client(user_id):
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+def test_anonymous_gets_status_only(monkeypatch):
+    monkeypatch.setattr(app_module, 'router', FakeRouter())
+    response = app_module.app.test_client().get('/healthz')
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+def test_signed_in_admin_gets_details(monkeypatch):
+    router = FakeRouter(rows=[('admin',)])
+    monkeypatch.setattr(app_module, 'router', router)
+    response = signed_in_client(1).get('/healthz')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['status'] == 'ok'
+    assert 'database' in body and 'requests' in body
+    assert router.connections and all(connection.closes == 1 for connection in router.connections)
+
+@pytest.mark.parametrize('role', ['member', 'editor', None])
+def test_signed_in_non_admin_gets_status_only(monkeypatch, role):
+    monkeypatch.setattr(app_module, 'router', FakeRouter(rows=[(role,)] if role else []))
+    response = signed_in_client(2).get('/healthz')
+    assert response.get_json() == {"status": "ok"}
+
+def test_health_token_gets_details(monkeypatch):
+    monkeypatch.setattr(app_module, 'router', FakeRouter())
+    monkeypatch.setattr(app_module, 'HEALTH_TOKEN', 'probe-secret')
+    client = app_module.app.test_client()
+    assert 'database' in client.get('/healthz', headers={'X-Health-Token': 'probe-secret'}).get_json()
+    assert client.get('/healthz', headers={'X-Health-Token': 'wrong'}).get_json() == {"status": "ok"}
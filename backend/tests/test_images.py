@@ -0,0 +1,28 @@
+"""
+Initials avatars: every key avatar_url() hands out must be one serve_media accepts.
+"""
+import images
+
+NAMES = [
+    "Jane Doe", "J.", "X-Men", "O'Neil", "Mary-Jane O'Brien", "(Admin)", "...", "", None,
+    "  ", "李小龙", "Émile Zola", "straße", "ǆemal", "ﬁona", "Dr. J. R. R. Tolkien", "42",
+    "İsmail", "x²", "_underscore_", "Ωmega ψ"
+]
+
+def test_initials_keys_parse_back():
+    for name in NAMES:
+        key = images.initials_avatar_key(name)
+        parsed = images.parse_initials_key(key)
+        assert parsed is not None, (name, key)
+        assert parsed[0] == images.initials_for(name)
+
+def test_initials_use_letters_and_digits_only():
+    assert images.initials_for("J.") == "J"
+    assert images.initials_for("X-Men") == "XM"
+    assert images.initials_for("O'Neil") == "ON"
+    assert images.initials_for("Jane Doe") == "JD"
+    assert images.initials_for("...") == "?"
+
+def test_unknown_initials_keys_are_rejected():
+    assert images.parse_initials_key("i" + images.AVATAR_COLORS[0] + "J.".encode().hex()) is None
+    assert images.parse_initials_key("i000000" + "JD".encode().hex()) is None
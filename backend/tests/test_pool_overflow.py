@@ -0,0 +1,70 @@
+"""
+Endpoint checkout past an exhausted pool: a bounded number of overflow
+connections, then a short wait, then DatabaseUnavailable instead of
+another connection to the server.
+"""
+import queue
+
+import pytest
+from mysql.connector import pooling
+
+import db
+from db import DatabaseUnavailable, Endpoint
+
+class ExhaustedPool:
+    def __init__(self):
+        self._cnx_queue = queue.Queue()
+
+    def get_connection(self):
+        try:
+            return self._cnx_queue.get_nowait()
+        except queue.Empty:
+            raise pooling.PoolError("Failed getting connection; pool exhausted")
+
+class DriverConnection:
+    closes = 0
+
+    def close(self):
+        self.closes += 1
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    opened = []
+
+    def connect(**config):
+        opened.append(DriverConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(db.mysql.connector, 'connect', connect)
+    endpoint = Endpoint('primary', {}, pool_size=1, max_overflow=2, pool_wait_seconds=0.05)
+    endpoint._pool = ExhaustedPool()
+    endpoint.opened = opened
+    return endpoint
+
+def test_overflow_is_capped(endpoint):
+    first, second = endpoint.connect(), endpoint.connect()
+    with pytest.raises(DatabaseUnavailable):
+        endpoint.connect()
+    assert len(endpoint.opened) == 2
+    stats = endpoint.stats()
+    assert stats['overflowInUse'] == 2
+    assert stats['poolTimeouts'] == 1
+    # Exhaustion says nothing about the server's health
+    assert endpoint.breaker.state == endpoint.breaker.CLOSED
+
+def test_closing_an_overflow_connection_frees_its_slot(endpoint):
+    first, second = endpoint.connect(), endpoint.connect()
+    first.close()
+    first.close()
+    assert endpoint.opened[0].closes == 1
+    assert endpoint.overflow_in_use() == 1
+    endpoint.connect()
+    assert len(endpoint.opened) == 3
+
+def test_waiting_checkout_gets_a_returned_pooled_connection(endpoint, monkeypatch):
+    endpoint.connect(), endpoint.connect()
+    pooled = DriverConnection()
+    # The pooled connection comes back while the third checkout waits
+    monkeypatch.setattr(db.time, 'sleep', lambda seconds: endpoint._pool._cnx_queue.put(pooled))
+    connection = endpoint.connect()
+    assert db.driver_connection(connection) is pooled
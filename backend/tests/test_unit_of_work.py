@@ -0,0 +1,74 @@
+"""
+Failure injection for request-scoped connections: whatever a handler does,
+every connection it took is released, and a failed commit is not reported
+as a success.
+"""
+import pytest
+
+import app as app_module
+from db import UnitOfWork
+from fakes import FakeRouter
+
+# Unit of work of the last request to /_test/failing
+failed_units_of_work = []
+
+def failing_handler():
+    db = app_module.get_db_connection(readonly=False)
+    db.cursor().execute("UPDATE users SET name = %s WHERE id = %s", ("x", 1))
+    app_module.get_db_connection(readonly=True).cursor()
+    failed_units_of_work.append(app_module.g.unit_of_work)
+    raise RuntimeError("injected failure halfway through the handler")
+
+def writing_handler():
+    db = app_module.get_db_connection(readonly=False)
+    db.cursor().execute("UPDATE users SET name = %s WHERE id = %s", ("x", 1))
+    return app_module.jsonify({"success": True})
+
+app_module.app.add_url_rule('/_test/failing', 'test_failing', failing_handler)
+app_module.app.add_url_rule('/_test/writing', 'test_writing', writing_handler, methods=['POST'])
+
+@pytest.fixture
+def fake_router(monkeypatch):
+    router = FakeRouter()
+    monkeypatch.setattr(app_module, 'router', router)
+    return router
+
+def test_unit_of_work_releases_everything_on_exception():
+    router = FakeRouter()
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(router) as unit_of_work:
+            unit_of_work.connection().cursor()
+            unit_of_work.connection(readonly=True).cursor()
+            raise RuntimeError("injected")
+    assert unit_of_work.open_connections() == 0
+    for connection in router.connections:
+        assert connection.rollbacks == 1
+        assert connection.commits == 0
+        assert connection.closes == 1
+        assert all(cursor.closed for cursor in connection.cursors)
+
+def test_request_failing_midway_leaks_no_connection(fake_router):
+    response = app_module.app.test_client().get('/_test/failing')
+    assert response.status_code == 500
+    assert failed_units_of_work[-1].open_connections() == 0
+    assert len(fake_router.connections) == 2
+    for connection in fake_router.connections:
+        assert connection.rollbacks == 1
+        assert connection.commits == 0
+        assert connection.closes == 1
+        assert all(cursor.closed for cursor in connection.cursors)
+
+def test_successful_write_is_committed_before_the_response(fake_router):
+    response = app_module.app.test_client().post('/_test/writing')
+    assert response.status_code == 200
+    [connection] = fake_router.connections
+    assert connection.commits == 1
+    assert connection.closes == 1
+
+def test_failed_commit_is_reported_as_an_error(monkeypatch):
+    router = FakeRouter(fail_commit=True)
+    monkeypatch.setattr(app_module, 'router', router)
+    response = app_module.app.test_client().post('/_test/writing')
+    assert response.status_code == 500
+    [connection] = router.connections
+    assert connection.closes == 1
@@ -149,8 +149,62 @@ function AdminPanel() {
   const [teamMembers, setTeamMembers] = useState<TeamMember[]>([]);
   const [teamApiMissing, setTeamApiMissing] = useState(false);
   const [registrations, setRegistrations] = useState<ClubRegistration[]>([]);
+  // The user list is filtered, sorted and paged by the server; usersTotal comes from X-Total-Count
+  const [userSearch, setUserSearch] = useState('');
+  const [userQuery, setUserQuery] = useState({ q: '', role: '', status: '', sort: 'newest', page: 1 });
+  const [usersTotal, setUsersTotal] = useState(0);
   const { user } = useAuth();
   const navigate = useNavigate();
+  const USERS_PAGE_SIZE = 50;
+
+  // Debounce the search box before querying
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setUserQuery(query => query.q === userSearch.trim() ? query : { ...query, q: userSearch.trim(), page: 1 });
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [userSearch]);
+
+  useEffect(() => {
+    async function fetchUsers() {
+      const params = new URLSearchParams({ sort: userQuery.sort, page: String(userQuery.page), pageSize: String(USERS_PAGE_SIZE) });
+      if (userQuery.q) params.set('q', userQuery.q);
+      if (userQuery.role) params.set('role', userQuery.role);
+      if (userQuery.status) params.set('status', userQuery.status);
+      
+      try {
+        const usersResponse = await fetch(`${API_BASE_URL}/users?${params}`, {
+          credentials: 'include',
+          headers: user ? { 'X-User-ID': user.id } : {}
+        });
+        
+        if (usersResponse.status === 404) {
+          // If the endpoint doesn't exist, use mock data
+          console.warn('API endpoint /api/users not found. Using mock data instead.');
+          setUsers(MOCK_USERS);
+          setUsersTotal(MOCK_USERS.length);
+          setUserApiMissing(true);
+        } else if (!usersResponse.ok) {
+          console.error('Failed to fetch users. Status:', usersResponse.status);
+          const errorText = await usersResponse.text();
+          console.error('Error response body:', errorText);
+          throw new Error(`Failed to fetch users. Status: ${usersResponse.status}`);
+        } else {
+          const usersData = await usersResponse.json();
+          setUsers(usersData);
+          setUsersTotal(Number(usersResponse.headers.get('X-Total-Count') ?? usersData.length));
+          setUserApiMissing(false);
+        }
+      } catch (userError) {
+        console.error('Error fetching users:', userError);
+        setUsers(MOCK_USERS);
+        setUsersTotal(MOCK_USERS.length);
+        setUserApiMissing(true);
+      }
+    }
+    
+    fetchUsers();
+  }, [user, userQuery]);
 
   useEffect(() => {
     async function fetchData() {
@@ -188,40 +242,6 @@ function AdminPanel() {
         const postsData = await postsResponse.json();
         setBlogPosts(postsData);
         
-        // Try to fetch users, but handle 404 gracefully
-        try {
-          console.log('Attempting to fetch users with headers:', 
-            user ? { 'X-User-ID': user.id } : {});
-          
-          const usersResponse = await fetch(`${API_BASE_URL}/users`, {
-            credentials: 'include',
-            headers: user ? { 'X-User-ID': user.id } : {}
-          });
-          
-          console.log('Users API response status:', usersResponse.status);
-          
-          if (usersResponse.status === 404) {
-            // If the endpoint doesn't exist, use mock data
-            console.warn('API endpoint /api/users not found. Using mock data instead.');
-            setUsers(MOCK_USERS);
-            setUserApiMissing(true);
-          } else if (!usersResponse.ok) {
-            console.error('Failed to fetch users. Status:', usersResponse.status);
-            const errorText = await usersResponse.text();
-            console.error('Error response body:', errorText);
-            throw new Error(`Failed to fetch users. Status: ${usersResponse.status}`);
-          } else {
-            const usersData = await usersResponse.json();
-            console.log('Successfully fetched users:', usersData);
-            setUsers(usersData);
-            setUserApiMissing(false);
-          }
-        } catch (userError) {
-          console.error('Error fetching users:', userError);
-          setUsers(MOCK_USERS);
-          setUserApiMissing(true);
-        }
-
         // Try to fetch contact requests, but handle 404 gracefully
         try {
           console.log('Attempting to fetch contact requests with headers:', 
@@ -698,11 +718,53 @@ function AdminPanel() {
                     </div>
               )}
               
+              <div className="flex flex-wrap gap-3">
+                <input
+                  type="search"
+                  value={userSearch}
+                  onChange={(e) => setUserSearch(e.target.value)}
+                  placeholder="Search by name or email"
+                  className="flex-1 min-w-[12rem] px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-white"
+                />
+                <select
+                  value={userQuery.role}
+                  onChange={(e) => setUserQuery({ ...userQuery, role: e.target.value, page: 1 })}
+                  className="px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-white"
+                >
+                  <option value="">All roles</option>
+                  {['user', 'researcher', 'editor', 'moderator', 'admin'].map(role => (
+                    <option key={role} value={role}>{role.charAt(0).toUpperCase() + role.slice(1)}</option>
+                  ))}
+                </select>
+                <select
+                  value={userQuery.status}
+                  onChange={(e) => setUserQuery({ ...userQuery, status: e.target.value, page: 1 })}
+                  className="px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-white"
+                >
+                  <option value="">All statuses</option>
+                  {['active', 'muted', 'banned', 'suspended'].map(status => (
+                    <option key={status} value={status}>{status.charAt(0).toUpperCase() + status.slice(1)}</option>
+                  ))}
+                </select>
+                <select
+                  value={userQuery.sort}
+                  onChange={(e) => setUserQuery({ ...userQuery, sort: e.target.value, page: 1 })}
+                  className="px-3 py-2 border border-gray-300 dark:border-gray-600 rounded-md bg-white dark:bg-gray-700 text-gray-900 dark:text-white"
+                >
+                  <option value="newest">Newest first</option>
+                  <option value="oldest">Oldest first</option>
+                  <option value="name">Name</option>
+                  <option value="email">Email</option>
+                </select>
+              </div>
+              
               {users.length === 0 ? (
                 <div className="text-center py-12 bg-gray-50 dark:bg-gray-700 rounded-lg">
                   <Users className="w-12 h-12 text-gray-400 mx-auto mb-4" />
                   <h3 className="text-lg font-medium text-gray-900 dark:text-white mb-2">No Users</h3>
-                  <p className="text-gray-500 dark:text-gray-400">There are no users in the system yet.</p>
+                  <p className="text-gray-500 dark:text-gray-400">
+                    {userQuery.q || userQuery.role || userQuery.status ? 'No users match these filters.' : 'There are no users in the system yet.'}
+                  </p>
                 </div>
               ) : (
                 <div className="overflow-x-auto">
@@ -774,6 +836,27 @@ function AdminPanel() {
                 ))}
                     </tbody>
                   </table>
+                  <div className="flex justify-between items-center px-6 py-3 text-sm text-gray-500 dark:text-gray-400">
+                    <span>
+                      {(userQuery.page - 1) * USERS_PAGE_SIZE + 1}–{(userQuery.page - 1) * USERS_PAGE_SIZE + users.length} of {usersTotal}
+                    </span>
+                    <div className="flex space-x-2">
+                      <button
+                        onClick={() => setUserQuery({ ...userQuery, page: userQuery.page - 1 })}
+                        disabled={userQuery.page === 1}
+                        className="px-3 py-1 rounded-md bg-gray-100 dark:bg-gray-700 disabled:opacity-50"
+                      >
+                        Previous
+                      </button>
+                      <button
+                        onClick={() => setUserQuery({ ...userQuery, page: userQuery.page + 1 })}
+                        disabled={userQuery.page * USERS_PAGE_SIZE >= usersTotal}
+                        className="px-3 py-1 rounded-md bg-gray-100 dark:bg-gray-700 disabled:opacity-50"
+                      >
+                        Next
+                      </button>
+                    </div>
+                  </div>
             </div>
           )}
             </div>
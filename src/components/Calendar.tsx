@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
-import { Calendar as CalendarIcon, Clock, MapPin, Users } from 'lucide-react';
+import { Calendar as CalendarIcon, ChevronLeft, ChevronRight, Clock, MapPin, Users } from 'lucide-react';
 
 // API base URL - can be changed to match your environment
 const API_BASE_URL = 'http://localhost:5000/api';
@@ -15,6 +15,7 @@ interface Event {
   capacity: number;
   registeredUsers: number;
   isRegistered?: boolean;
+  remainingCapacity?: number;
 }
 
 // Mock data for development when backend is unavailable
@@ -51,9 +52,24 @@ const MOCK_EVENTS: Event[] = [
   }
 ];
 
+// YYYY-MM-DD in local time, the format the events window parameters expect
+const formatDate = (date: Date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`;
+
+// ?from=&to= covering every day of the month that contains `month`
+const monthWindow = (month: Date) => {
+  const first = new Date(month.getFullYear(), month.getMonth(), 1);
+  const last = new Date(month.getFullYear(), month.getMonth() + 1, 0);
+  return `from=${formatDate(first)}&to=${formatDate(last)}`;
+};
+
 function Calendar() {
   const { user } = useAuth();
   const [events, setEvents] = useState<Event[]>([]);
+  const [visibleMonth, setVisibleMonth] = useState(() => {
+    const today = new Date();
+    return new Date(today.getFullYear(), today.getMonth(), 1);
+  });
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [newEvent, setNewEvent] = useState<Omit<Event, 'id' | 'registeredUsers'>>({
@@ -75,57 +91,21 @@ function Calendar() {
         setIsLoading(true);
         setError(null);
         
-        const response = await fetch(`${API_BASE_URL}/events`);
+        // Only the visible month is fetched; signed-in users get each event with
+        // their registration state in the same response
+        const range = monthWindow(visibleMonth);
+        const response = user
+          ? await fetch(`${API_BASE_URL}/user/events?${range}`, { credentials: 'include' })
+          : await fetch(`${API_BASE_URL}/events?${range}`);
         if (!response.ok) {
           const errorText = await response.text();
           console.error(`Failed to fetch events: ${response.status} - ${errorText}`);
           throw new Error(`Failed to fetch events: ${response.status}`);
         }
         
-        let data = await response.json();
+        const data = await response.json();
         console.log(`Fetched ${data.length} events from server`);
-        
-        // Process events to check if user is registered
-        if (user) {
-          try {
-            // If user is logged in, fetch registration status for each event
-            const registrationsResponse = await fetch(`${API_BASE_URL}/events/registrations`, {
-              credentials: 'include'
-            });
-            
-            if (registrationsResponse.ok) {
-              const registrationData = await registrationsResponse.json();
-              console.log(`Fetched ${registrationData.length} event registrations`);
-              
-              // Map of event IDs that the user is registered for
-              const registeredEventIds = new Set(registrationData.map((reg: { eventId: string }) => reg.eventId));
-              
-              const eventsWithRegistration = data.map((event: Event) => ({
-                ...event,
-                isRegistered: registeredEventIds.has(event.id)
-              }));
-              setEvents(eventsWithRegistration);
-            } else {
-              // If fetching registrations fails, use mock data or default to not registered
-              console.warn('Failed to fetch event registrations, using default values');
-              const eventsWithRegistration = data.map((event: Event) => ({
-                ...event,
-                isRegistered: false
-              }));
-              setEvents(eventsWithRegistration);
-            }
-          } catch (registrationsError) {
-            console.error('Error fetching registrations:', registrationsError);
-            // If there's an error with registrations, still show events without registration status
-          const eventsWithRegistration = data.map((event: Event) => ({
-            ...event,
-              isRegistered: false
-          }));
-          setEvents(eventsWithRegistration);
-          }
-        } else {
-          setEvents(data);
-        }
+        setEvents(data);
       } catch (error) {
         console.error('Error fetching events:', error);
         setError('Failed to load events');
@@ -139,7 +119,11 @@ function Calendar() {
     };
 
     fetchEvents();
-  }, [user]);
+  }, [user, visibleMonth]);
+
+  const changeMonth = (offset: number) => {
+    setVisibleMonth(new Date(visibleMonth.getFullYear(), visibleMonth.getMonth() + offset, 1));
+  };
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -357,6 +341,25 @@ function Calendar() {
     <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-12 mt-8">
       <div className="flex justify-between items-center mb-8">
         <h1 className="text-3xl font-bold text-gray-900 dark:text-white">Upcoming Events</h1>
+        <div className="flex items-center space-x-2">
+          <button
+            onClick={() => changeMonth(-1)}
+            aria-label="Previous month"
+            className="p-2 rounded-md text-gray-700 dark:text-gray-300 hover:bg-gray-100 dark:hover:bg-gray-700"
+          >
+            <ChevronLeft className="h-5 w-5" />
+          </button>
+          <span className="w-40 text-center text-lg font-medium text-gray-900 dark:text-white">
+            {visibleMonth.toLocaleDateString('en-US', { year: 'numeric', month: 'long' })}
+          </span>
+          <button
+            onClick={() => changeMonth(1)}
+            aria-label="Next month"
+            className="p-2 rounded-md text-gray-700 dark:text-gray-300 hover:bg-gray-100 dark:hover:bg-gray-700"
+          >
+            <ChevronRight className="h-5 w-5" />
+          </button>
+        </div>
       </div>
 
       {error && (
@@ -7,13 +7,16 @@ import { API_BASE_URL } from '../config';
 interface ForumPost {
   id: string;
   title: string;
-  content: string;
+  // The index returns a truncated preview; a newly created post has its full content
+  preview?: string;
+  content?: string;
   author: {
     id: string;
     name: string;
     avatar: string;
   };
   timestamp: string;
+  lastActivity?: string;
   replies: number;
 }
 
@@ -21,25 +24,49 @@ function Forum() {
   const [posts, setPosts] = useState<ForumPost[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [newPost, setNewPost] = useState({ title: '', content: '' });
   const [isSubmitting, setIsSubmitting] = useState(false);
   const { user } = useAuth();
   const navigate = useNavigate();
 
+  // Threads come newest activity first, a page at a time; X-Next-Cursor points at the next page
+  const fetchPage = async (cursor: string | null) => {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE_URL}/forum${query}`, {
+      credentials: 'include',
+      headers: user?.isTestUser ? { 'X-User-ID': user.id } : {}
+    });
+    
+    if (!response.ok) {
+      throw new Error(`Failed to fetch forum posts: ${response.status} ${response.statusText}`);
+    }
+    
+    const data: ForumPost[] = await response.json();
+    setNextCursor(response.headers.get('X-Next-Cursor'));
+    return data;
+  };
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const data = await fetchPage(nextCursor);
+      setPosts(prev => [...prev, ...data.filter(post => !prev.some(existing => existing.id === post.id))]);
+    } catch (err) {
+      console.error("Error fetching more forum posts:", err);
+      setError(err instanceof Error ? err.message : 'An error occurred');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     const fetchPosts = async () => {
       try {
         console.log("Fetching forum posts...");
-        const response = await fetch(`${API_BASE_URL}/forum`, {
-          credentials: 'include',
-          headers: user?.isTestUser ? { 'X-User-ID': user.id } : {}
-        });
-        
-        if (!response.ok) {
-          throw new Error(`Failed to fetch forum posts: ${response.status} ${response.statusText}`);
-        }
-        
-        const data = await response.json();
+        const data = await fetchPage(null);
         console.log("Fetched forum posts:", data);
         setPosts(data);
       } catch (err) {
@@ -193,7 +220,7 @@ function Forum() {
                 </div>
               </div>
             </div>
-            <p className="text-gray-600 dark:text-gray-300 mb-4">{post.content}</p>
+            <p className="text-gray-600 dark:text-gray-300 mb-4">{post.preview ?? post.content}</p>
             <div className="flex items-center text-gray-500 dark:text-gray-400">
               <MessageSquare className="h-4 w-4 mr-1" />
               <span>{post.replies} {post.replies === 1 ? 'reply' : 'replies'}</span>
@@ -201,6 +228,18 @@ function Forum() {
           </article>
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="mt-8 flex justify-center">
+          <button
+            onClick={loadMore}
+            disabled={isLoadingMore}
+            className="bg-indigo-600 text-white px-4 py-2 rounded-md hover:bg-indigo-700 transition-colors disabled:opacity-50"
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -23,6 +23,8 @@ interface ForumPostDetail {
   content: string;
   timestamp: string;
   author: Author;
+  replyCount: number;
+  // One page of replies; X-Prev-Cursor / X-Next-Cursor point at the neighbouring pages
   replies: Reply[];
 }
 
@@ -33,9 +35,44 @@ function ForumDetail() {
   const [error, setError] = useState<string | null>(null);
   const [newReply, setNewReply] = useState('');
   const [isSubmitting, setIsSubmitting] = useState(false);
+  const [prevCursor, setPrevCursor] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingReplies, setIsLoadingReplies] = useState(false);
   const { user } = useAuth();
   const navigate = useNavigate();
 
+  const requestHeaders = user?.isTestUser ? { 'X-User-ID': user.id } : {};
+
+  // query selects the page: cursor=<next>, before=<prev> or latest=1
+  const loadReplies = async (query: string, merge: (current: Reply[], page: Reply[]) => Reply[], cursors: 'prev' | 'next' | 'both') => {
+    if (!post) return;
+    setIsLoadingReplies(true);
+    try {
+      const response = await fetch(`${API_BASE_URL}/forum/${postId}/replies?${query}`, {
+        credentials: 'include',
+        headers: requestHeaders
+      });
+      if (!response.ok) {
+        throw new Error(`Failed to fetch replies: ${response.status} ${response.statusText}`);
+      }
+      const page: Reply[] = await response.json();
+      setPost(current => current && { ...current, replies: merge(current.replies, page) });
+      if (cursors !== 'next') setPrevCursor(response.headers.get('X-Prev-Cursor'));
+      if (cursors !== 'prev') setNextCursor(response.headers.get('X-Next-Cursor'));
+    } catch (err) {
+      console.error('Error fetching replies:', err);
+      setError(err instanceof Error ? err.message : 'An error occurred');
+    } finally {
+      setIsLoadingReplies(false);
+    }
+  };
+
+  const loadEarlier = () => prevCursor &&
+    loadReplies(`before=${encodeURIComponent(prevCursor)}`, (current, page) => [...page, ...current], 'prev');
+  const loadLater = () => nextCursor &&
+    loadReplies(`cursor=${encodeURIComponent(nextCursor)}`, (current, page) => [...current, ...page], 'next');
+  const jumpToLatest = () => loadReplies('latest=1', (_current, page) => page, 'both');
+
   useEffect(() => {
     const fetchPostDetail = async () => {
       if (!postId) {
@@ -48,7 +85,7 @@ function ForumDetail() {
         console.log(`Fetching forum post ${postId} details...`);
         const response = await fetch(`${API_BASE_URL}/forum/${postId}`, {
           credentials: 'include',
-          headers: user?.isTestUser ? { 'X-User-ID': user.id } : {}
+          headers: requestHeaders
         });
 
         if (!response.ok) {
@@ -58,6 +95,8 @@ function ForumDetail() {
         const data = await response.json();
         console.log('Fetched post details:', data);
         setPost(data);
+        setPrevCursor(response.headers.get('X-Prev-Cursor'));
+        setNextCursor(response.headers.get('X-Next-Cursor'));
       } catch (err) {
         console.error('Error fetching post details:', err);
         setError(err instanceof Error ? err.message : 'An error occurred');
@@ -110,11 +149,12 @@ function ForumDetail() {
       const data = await response.json();
       console.log('Reply created successfully:', data);
       
-      // Update the post with the new reply
+      // Show the new reply if the last page is loaded; otherwise it appears when the reader gets there
       if (post) {
         setPost({
           ...post,
-          replies: [...post.replies, data]
+          replyCount: post.replyCount + 1,
+          replies: nextCursor ? post.replies : [...post.replies, data]
         });
       }
       
@@ -205,11 +245,30 @@ function ForumDetail() {
       {/* Replies section */}
       <div className="mb-8">
         <h2 className="text-xl font-semibold mb-4 text-gray-900 dark:text-white">
-          {post.replies.length === 0
+          {post.replyCount === 0
             ? 'No replies yet'
-            : `${post.replies.length} ${post.replies.length === 1 ? 'Reply' : 'Replies'}`}
+            : `${post.replyCount} ${post.replyCount === 1 ? 'Reply' : 'Replies'}`}
         </h2>
 
+        {(prevCursor || nextCursor) && (
+          <div className="flex justify-between mb-4 text-sm">
+            <button
+              onClick={loadEarlier}
+              disabled={!prevCursor || isLoadingReplies}
+              className="text-indigo-600 hover:text-indigo-800 disabled:opacity-0"
+            >
+              Load earlier replies
+            </button>
+            <button
+              onClick={jumpToLatest}
+              disabled={!nextCursor || isLoadingReplies}
+              className="text-indigo-600 hover:text-indigo-800 disabled:opacity-0"
+            >
+              Jump to latest
+            </button>
+          </div>
+        )}
+
         <div className="space-y-4">
           {post.replies.map((reply) => (
             <div
@@ -235,6 +294,18 @@ function ForumDetail() {
             </div>
           ))}
         </div>
+
+        {nextCursor && (
+          <div className="mt-4 flex justify-center">
+            <button
+              onClick={loadLater}
+              disabled={isLoadingReplies}
+              className="bg-indigo-600 text-white px-4 py-2 rounded-md hover:bg-indigo-700 transition-colors disabled:opacity-50"
+            >
+              {isLoadingReplies ? 'Loading...' : 'Load more replies'}
+            </button>
+          </div>
+        )}
       </div>
 
       {/* Reply form */}
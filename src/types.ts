@@ -56,6 +56,7 @@ export interface User {
   avatar: string;
   isTestUser?: boolean;
   joinDate?: string;
+  status?: 'active' | 'muted' | 'banned' | 'suspended';
 }
 
 export interface ContactRequest {